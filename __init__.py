@@ -19,6 +19,12 @@ r"""
     
     Class Methods
     -------------------------------------------------
+    *latex_table*.from_csv / *latex_table*.from_iterable:
+        Create a table from a csv-file or an iterable of rows, read a chunk of rows at the time
+        
+    *latex_table*.from_npy:
+        Make a table from a memory mapped .npy-file, rendered a block of rows at the time
+        
     *latex_table*.info()
         Show info of current content and settings of the table.
     
@@ -28,9 +34,27 @@ r"""
     *latex_table*.make_multirow:	
         Makes a multirow in the table
         
+    *latex_table*.highlight / *latex_table*.where:
+        Format the largest or smallest number of each row or column, or the numbers meeting a condition, when rendering
+        
+    *latex_table*.profile:
+        Context manager timing and memory profiling the phases of every table made, rendered or saved inside it
+        
+    *latex_table*.render:
+        The table as a string, with jobs = N the rows are formatted in N processes
+        
     *latex_table*.save:	
         Save the table to a file
         
+    *latex_table*.save_async / *latex_table*.iter_document_async:
+        Save or iterate over the table from asyncio code, the rows are formatted in a shared thread pool
+        
+    *latex_table*.split / *latex_table*.render_split:
+        Cut the table into pieces of N rows or N columns, rendered in parallel processes with render_split
+        
+    *latex_table*.stream:
+        Write the table to a file or file-like object a block of rows at the time
+        
     *latex_table*.set_formatters: 
         Set strings that will encapsulate the corresponding element. Ex \textbf{}.
         
@@ -40,17 +64,36 @@ r"""
         
     *latex_table*.set_uncertantiy:
         Applies uncertainties to the existing data from a new vector or array by combining each element into \num{value \pm error}
+        or $value^{+error}_{-lower}$ for asymmetric uncertainties. Uncertainties can be relative to the values and rounded to
+        a number of significant digits, or by the rule of the Particle Data Group, with digits = 'pdg'.
         
     *latex_table*.set_units:
         Sets units at the bottom of each column title. Formatted into \unit{} from siunitx
+        
+    *latex_table*.template:
+        The finished layout of the table for new data of the same columns. template.bind(*columns) makes a new table
+        and template.render(*columns) renders it, the titles are rendered once and nothing is replayed
 
     
+    Batch Functions
+    -------------------------------------------------
+    render_many(tables, jobs):
+        Render many tables in parallel processes, returns the outputs with timings and errors
+        
+    save_many(tables, jobs):
+        Save many tables under latex_table.table_path in parallel processes, returns timings and errors
+        
+    
     Special Member Variables
     -------------------------------------------------
     
     latex_table.table_path:
         Lists the path to the directory where the saved tables will be placed.
         It is static and typically only needs to be set one at the start of the script.
+        
+    latex_table.digest_index:
+        Name of a file in latex_table.table_path recording the digests of the saved tables, ex. ".table_digests".
+        save() skips files whose content is unchanged, with the index it does not need to read them to know.
     
     Examples
     -------------------------------------------------
@@ -92,5 +135,6 @@ r"""
 
 from .src.latex_table import latex_table
 from .src.helper_functions import latex_formatter
+from .src.batch import render_many, save_many
 
 
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Table benchmarks
+
+Times and memory profiles building, editing and rendering tables from 10 to 10^6 cells,
+with pandas.DataFrame.to_latex as a reference.
+
+The classes follow the asv conventions (params, setup, time_* and peakmem_* methods) and can also be run
+without asv, every benchmark is then run in this process and its best time and peak traced memory is printed.
+
+    python benchmarks/bench_table.py [-k name filter] [-n sizes] [-r repeats]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from src.latex_table import latex_table
+
+SIZES = [10, 1000, 100000, 1000000] # Number of cells
+COLUMNS = 10
+JOBS = max(2, os.cpu_count() or 1) # Processes for the parallel render
+
+
+def make_data(n_cells) -> np.ndarray:
+    "Random numbers with a few decimals, n_cells of them in at most COLUMNS columns"
+    cols = min(n_cells, COLUMNS)
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(n_cells // cols, cols)).round(3)
+
+def make_table(n_cells) -> latex_table:
+    data = make_data(n_cells)
+    return latex_table(data, titles=[f"c{j}" for j in range(data.shape[1])])
+
+
+class Construct:
+    "The three input modes of the constructor"
+    params = SIZES
+    param_names = ["cells"]
+
+    def setup(self, n_cells):
+        self.array = make_data(n_cells)
+        self.titles = [f"c{j}" for j in range(self.array.shape[1])]
+        self.columns = list(self.array.T)
+        self.dict = dict(zip(self.titles, self.columns))
+
+    def time_ndarray(self, n_cells):
+        latex_table(self.array, titles=self.titles)
+
+    def time_columns(self, n_cells):
+        latex_table(self.titles, *self.columns)
+
+    def time_dict(self, n_cells):
+        latex_table(self.dict)
+
+    def peakmem_ndarray(self, n_cells):
+        latex_table(self.array, titles=self.titles)
+
+
+class Edit:
+    "Edits of an existing table, a new table is made for every run"
+    params = SIZES
+    param_names = ["cells"]
+    number = 1
+
+    def setup(self, n_cells):
+        self.table = make_table(n_cells)
+        self.rows, self.cols = self.table.rows, self.table.cols
+        # Render once so edits also pay for dropping what was cached
+        str(self.table)
+
+    def time_set_units(self, n_cells):
+        self.table.set_units([r"\meter"] * self.cols)
+
+    # The spans are only recorded in the layout plan, accessing data applies them to the cells
+    def time_make_multicolumn(self, n_cells):
+        self.table.make_multicolumn("tabular", self.rows // 2, 0, min(2, self.cols), "mc", cline=True)
+        self.table.data
+
+    def time_make_multicolumn_insert(self, n_cells):
+        self.table.make_multicolumn("tabular", self.rows // 2, 0, min(2, self.cols), "mc", insert=True, cline=True)
+        self.table.data
+
+    def time_make_multirow(self, n_cells):
+        self.table.make_multirow("tabular", 0, 0, min(2, self.rows), "mr")
+        self.table.data
+
+    def time_make_multirow_insert(self, n_cells):
+        self.table.make_multirow("tabular", 0, min(2, self.rows) - 1, min(2, self.rows), "mr", insert=True)
+        self.table.data
+
+    def time_set_uncertanty(self, n_cells):
+        self.table.set_uncertanty(np.full(self.rows, 0.01), 0)
+
+    def time_set_style_grid(self, n_cells):
+        self.table.set_style("grid")
+
+
+class Render:
+    "Rendering and saving a table for the first time"
+    params = SIZES
+    param_names = ["cells"]
+    number = 1
+
+    def setup(self, n_cells):
+        self.table = make_table(n_cells)
+        self.directory = tempfile.mkdtemp()
+
+    def teardown(self, n_cells):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def time_str(self, n_cells):
+        str(self.table)
+
+    def time_save(self, n_cells):
+        self.table.save(os.path.join(self.directory, "table.tex"), abspath=True)
+
+    def time_save_stream(self, n_cells):
+        self.table.save(os.path.join(self.directory, "table.tex"), abspath=True, stream=True)
+
+    def time_render_parallel(self, n_cells):
+        self.table.render(jobs = JOBS)
+
+    def peakmem_str(self, n_cells):
+        str(self.table)
+
+
+class Rerender:
+    "Rendering a table again after changing the formatting of one column"
+    params = SIZES
+    param_names = ["cells"]
+    number = 1
+
+    def setup(self, n_cells):
+        self.table = make_table(n_cells)
+        str(self.table)
+
+    def time_str_unchanged(self, n_cells):
+        str(self.table)
+
+    def time_str_one_column(self, n_cells):
+        self.table.set_formatters("bf", col=0)
+        str(self.table)
+
+
+class Baseline:
+    "pandas.DataFrame.to_latex on the same data, requires jinja2"
+    params = SIZES
+    param_names = ["cells"]
+
+    def setup(self, n_cells):
+        try:
+            import pandas as pd
+            import jinja2
+        except ImportError:
+            raise NotImplementedError("pandas.DataFrame.to_latex requires jinja2")
+        self.frame = pd.DataFrame(make_data(n_cells))
+
+    def time_to_latex(self, n_cells):
+        self.frame.to_latex(float_format="%.3f")
+
+    def peakmem_to_latex(self, n_cells):
+        self.frame.to_latex(float_format="%.3f")
+
+
+BENCHMARKS = [Construct, Edit, Render, Rerender, Baseline]
+
+def run(benchmark, method, n_cells, repeats) -> tuple:
+    """
+    Runs one benchmark with a fresh setup for every repeat.
+    Returns the best time in seconds and the peak memory traced during the first run in bytes.
+    """
+    times, peak = [], None
+    for i in range(repeats):
+        instance = benchmark()
+        instance.setup(n_cells)
+        try:
+            if peak is None:
+                tracemalloc.start()
+                method(instance, n_cells)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                continue
+            t = time.perf_counter()
+            method(instance, n_cells)
+            times.append(time.perf_counter() - t)
+        finally:
+            if hasattr(instance, "teardown"):
+                instance.teardown(n_cells)
+    return min(times), peak
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = __doc__.split("\n\n")[0].strip())
+    parser.add_argument("-k", default = "", help = "Only run benchmarks with this in their name")
+    parser.add_argument("-n", type = int, nargs = "+", default = SIZES, help = "Number of cells")
+    parser.add_argument("-r", type = int, default = 3, help = "Timed runs of each benchmark")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<40}{'cells':>10}{'time [ms]':>14}{'peak [MiB]':>12}")
+    for benchmark in BENCHMARKS:
+        names = [name for name in dir(benchmark) if name.startswith(("time_", "peakmem_"))]
+        for name in names:
+            full_name = f"{benchmark.__name__}.{name}"
+            # A peakmem benchmark has the same body as a time benchmark, the runner traces both
+            if args.k not in full_name or name.startswith("peakmem_"):
+                continue
+            for n_cells in args.n:
+                try:
+                    seconds, peak = run(benchmark, getattr(benchmark, name), n_cells, args.r + 1)
+                except NotImplementedError as e:
+                    print(f"{full_name:<40}{n_cells:>10}  skipped: {e}")
+                    break
+                print(f"{full_name:<40}{n_cells:>10}{seconds * 1000:>14.2f}{peak / 2**20:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Import time budget
+
+Imports the package in a fresh interpreter and checks that pandas is not loaded
+and that the import stays within the budget.
+
+    python benchmarks/import_time.py [budget in seconds]
+"""
+
+import sys
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET = 0.25 # Seconds, most of it is numpy
+
+IMPORT = f"""
+import sys, time, importlib.util
+t = time.perf_counter()
+spec = importlib.util.spec_from_file_location("latex_table_generator", r"{ROOT / '__init__.py'}",
+                                              submodule_search_locations=[r"{ROOT}"])
+module = importlib.util.module_from_spec(spec)
+sys.modules["latex_table_generator"] = module
+spec.loader.exec_module(module)
+print(time.perf_counter() - t, "pandas" in sys.modules)
+"""
+
+def measure(repeats = 5):
+    "Returns the best import time of a number of fresh interpreters and if pandas was imported"
+    times = []
+    for i in range(repeats):
+        out = subprocess.run([sys.executable, "-c", IMPORT], capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        pandas_loaded = out[1] == "True"
+    return min(times), pandas_loaded
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET
+    seconds, pandas_loaded = measure()
+    print(f"import latex_table_generator: {seconds * 1000:.1f} ms (budget {budget * 1000:.0f} ms), pandas loaded: {pandas_loaded}")
+    if pandas_loaded or seconds > budget:
+        sys.exit(1)
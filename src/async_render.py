@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                Async rendering
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import os
+import threading
+from .file_output import atomic_writer
+
+max_workers = min(4, os.cpu_count() or 1) # Threads shared by every async render and write
+_executor = None
+_lock = threading.Lock()
+
+
+def shared_executor():
+    """
+    The thread pool the async methods of latex_table run their work in, made on first use.
+    It is bounded by max_workers, so any number of tables rendered at the same time share the same threads
+    and take turns a block of rows at the time.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "latex_table")
+    return _executor
+
+async def iterate(iterator, executor = None):
+    """
+    Async generator yielding the items of a blocking iterator, every next() is run in the executor
+    so the event loop is free while the item is produced. The executor defaults to shared_executor().
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    executor = executor or shared_executor()
+    done = object()
+    while True:
+        item = await loop.run_in_executor(executor, next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+async def write(path, fragments, executor = None, index = None) -> bool:
+    """
+    Writes the fragments of an async iterator to path through an atomic_writer, see file_output.py.
+    Opening, writing and committing the file is done in the executor.
+
+    Returns:
+        bool: True if path was written, False if it already had the content.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    executor = executor or shared_executor()
+    file = await loop.run_in_executor(executor, atomic_writer, path, index)
+    try:
+        async for fragment in fragments:
+            await loop.run_in_executor(executor, file.write, fragment)
+    except BaseException:
+        await loop.run_in_executor(executor, file.discard)
+        raise
+    return await loop.run_in_executor(executor, file.commit)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                Batch rendering
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import os
+import time
+import traceback
+from .latex_table import latex_table
+
+
+def build_table(item) -> latex_table:
+    """Turns an item of a batch into a latex_table. Items can be:
+        - a latex_table, used as is
+        - a dict with the positional arguments of the constructor under 'data' and any keyword arguments,
+          ex. {'data': (titles, col_0, col_1), 'caption': 'A table'}
+        - a function without arguments returning a latex_table
+    """
+    if isinstance(item, latex_table):
+        return item
+    if isinstance(item, dict):
+        kwargs = dict(item)
+        return latex_table(*kwargs.pop("data"), **kwargs)
+    if callable(item):
+        return item()
+    raise TypeError(f"Can not make a latex_table from {type(item)}")
+
+def _new_result(name, error = None) -> dict:
+    return {"name": name, "path": None, "output": None, "written": None,
+            "build_time": 0.0, "render_time": 0.0, "error": error}
+
+def _run_job(job) -> dict:
+    "Builds and renders or saves one table. Runs in the worker processes"
+    name, item, table_path, index, save, stream = job
+    result = _new_result(name)
+    try:
+        t0 = time.perf_counter()
+        table = build_table(item)
+        t1 = time.perf_counter()
+        result["build_time"] = t1 - t0
+        if save:
+            latex_table.table_path = table_path
+            latex_table.digest_index = index
+            result["written"] = table.save(name, stream=stream)
+            result["path"] = table_path + name + ".tex"
+        else:
+            result["output"] = str(table)
+        result["render_time"] = time.perf_counter() - t1
+    except Exception:
+        result["error"] = traceback.format_exc()
+    return result
+
+def _run_batch(tables, jobs, save, stream) -> list:
+    if isinstance(tables, dict):
+        tables = tables.items()
+    # The static settings are passed on as the worker processes may not inherit them
+    batch = [(str(name), item, latex_table.table_path, latex_table.digest_index, save, stream)
+             for name, item in tables]
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(batch) <= 1:
+        return [_run_job(job) for job in batch]
+    from concurrent.futures import ProcessPoolExecutor
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = []
+        for job in batch:
+            try:
+                futures.append(executor.submit(_run_job, job))
+            except Exception:
+                futures.append(traceback.format_exc())
+        # One future per table, a job that can not be sent to a process, ex. a lambda, or whose process dies
+        # only fails its own table
+        for job, future in zip(batch, futures):
+            if isinstance(future, str):
+                results.append(_new_result(job[0], future))
+                continue
+            try:
+                results.append(future.result())
+            except Exception:
+                results.append(_new_result(job[0], traceback.format_exc()))
+    return results
+
+def render_many(tables, jobs: int = None) -> list:
+    """Renders many tables in parallel processes.
+
+    Args:
+        tables (dict/list): Mapping or list of (name, item) pairs. See build_table for valid items.
+        jobs (int, optional): Number of processes. Defaults to the number of cores, 1 renders in this process.
+
+    Returns:
+        list: One dict per table, in order, with the keys 'name', 'output' (the rendered table),
+        'build_time', 'render_time' (seconds) and 'error' (traceback or None).
+    """
+    return _run_batch(tables, jobs, save=False, stream=False)
+
+def save_many(tables, jobs: int = None, stream: bool = False) -> list:
+    """Saves many tables in parallel processes, each to latex_table.table_path + name + '.tex'.
+    A table that fails does not stop the others.
+
+    Args:
+        tables (dict/list): Mapping or list of (name, item) pairs. See build_table for valid items.
+        jobs (int, optional): Number of processes. Defaults to the number of cores, 1 saves in this process.
+        stream (bool, optional): Passed to latex_table.save.
+
+    Returns:
+        list: One dict per table, in order, with the keys 'name', 'path', 'written' (False if the file was unchanged),
+        'build_time', 'render_time' (seconds) and 'error' (traceback or None).
+    """
+    return _run_batch(tables, jobs, save=True, stream=stream)
@@ -0,0 +1,552 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                   Cell store
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import itertools
+import numpy as np
+from .helper_classes import is_multi
+from .helper_functions import typed_column, lazy_import
+
+pd = lazy_import("pandas")
+
+
+def object_array(L) -> np.ndarray:
+    "Makes a 1D object array without numpy unpacking tuples or lists in L into more dimensions"
+    return np.fromiter(L, dtype=object, count=len(L))
+
+def fits(column, value) -> bool:
+    "Checks if value can be stored in the column without changing its dtype. Multicolumns and multirows never are"
+    if is_multi(value):
+        return False
+    if column.dtype == object:
+        return True
+    if isinstance(value, (bool, np.bool_)):
+        return False
+    if column.dtype.kind == "f":
+        return isinstance(value, (int, float, np.integer, np.floating))
+    if isinstance(value, (int, np.integer)):
+        info = np.iinfo(column.dtype)
+        return info.min <= value <= info.max
+    return False
+
+
+def column_values(column) -> tuple:
+    """
+    Splits a column into its values and a bool array marking its missing values, None if nothing is missing.
+    Masked arrays and pyarrow arrays are read from their buffers, without copying where the type allows it.
+    """
+    if isinstance(column, np.ma.MaskedArray):
+        mask = np.ma.getmask(column)
+        return column.data, None if mask is np.ma.nomask or not mask.any() else mask
+    if hasattr(column, "null_count") and hasattr(column, "to_numpy"): # pyarrow Array or ChunkedArray
+        nulls = column.is_null().to_numpy(zero_copy_only = False) if column.null_count else None
+        return column.to_numpy(zero_copy_only = False), nulls
+    return column, None
+
+def series_values(series) -> np.ndarray:
+    """
+    The values of a pandas Series as an array. Columns of object or extension dtypes, ex. Int64 or string,
+    are masked where pandas sees a missing value, like pd.NA or None, so they are written as missing values.
+    """
+    if series.dtype != object and isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    nulls = series.isna().to_numpy()
+    if not nulls.any():
+        return series.to_numpy()
+    numpy_dtype = getattr(series.dtype, "numpy_dtype", None) # Of the nullable numbers and booleans
+    if numpy_dtype is not None and numpy_dtype.kind in "biuf":
+        values = series.to_numpy(dtype = numpy_dtype, na_value = numpy_dtype.type(0))
+    else:
+        values = series.to_numpy(dtype = object)
+    return np.ma.MaskedArray(values, nulls)
+
+def table_columns(data) -> tuple:
+    """
+    Splits a single object given to the constructor into its column titles, None if it has none, and its columns.
+
+    Structured and record arrays are split into their fields, pyarrow tables and DataFrames into their columns
+    and other arrays, including objects with the buffer protocol, along their 2nd axis.
+    Lists of rows are transposed and each column typed on its own, rows shorter than the longest are padded with nan.
+    The columns are views of data where possible. Titles that are not strings, ex. the numbers of a RangeIndex,
+    are turned into strings.
+    """
+    if hasattr(data, "iloc"): # DataFrame
+        return [str(title) for title in data.columns], [series_values(data.iloc[:, j]) for j in range(data.shape[1])]
+    if hasattr(data, "column_names") and hasattr(data, "column"): # pyarrow Table or RecordBatch
+        return list(data.column_names), [data.column(j) for j in range(data.num_columns)]
+    if isinstance(data, (list, tuple)) and data and all(isinstance(row, (list, tuple, np.ndarray)) for row in data):
+        # Typing the rows together would turn a table of strings and numbers into strings
+        return None, [typed_column(column) for column in itertools.zip_longest(*data, fillvalue=np.nan)]
+    if not isinstance(data, np.ndarray):
+        data = np.asarray(data)
+    if data.dtype.names:
+        return list(data.dtype.names), [data[name] for name in data.dtype.names]
+    if data.ndim == 1:
+        return None, [data]
+    return None, [data[:, j] for j in range(data.shape[1])]
+
+
+class sorted_cells:
+    """
+    Sparse cells, one dict per column {row: value}, with the rows of each column sorted once
+    so the cells in a block of rows are found by binary search instead of by looking at every cell.
+    """
+    def __init__(self, dicts):
+        self.rows, self.values = [], []
+        for cells in dicts:
+            rows = np.fromiter(cells, dtype = np.int64, count = len(cells))
+            order = np.argsort(rows, kind = "stable")
+            values = list(cells.values())
+            self.rows.append(rows[order])
+            self.values.append([values[k] for k in order])
+
+    def block(self, start, stop, cols = slice(None)) -> list:
+        "The cells in the rows start:stop of the columns cols, keyed by their row counted from start"
+        out = []
+        for rows, values in zip(self.rows[cols], self.values[cols]):
+            first, last = np.searchsorted(rows, (start, stop))
+            out.append(dict(zip((rows[first:last] - start).tolist(), values[first:last])))
+        return out
+
+
+class column_buffer:
+    """
+    A typed column filled a chunk at the time, for reading files without holding the chunks and the joined column
+    at once. The array is grown geometrically in place with ndarray.resize, which lets realloc move the pages
+    instead of copying them, and cut to its length by finish().
+    Chunks of another type than the column so far change the column to the common dtype, object for non-numbers.
+    """
+    def __init__(self):
+        self.array = None
+        self.size = 0
+
+    def append(self, chunk):
+        chunk = typed_column(chunk)
+        end = self.size + len(chunk)
+        if self.array is None:
+            self.array = np.empty(len(chunk), dtype = chunk.dtype)
+        elif chunk.dtype != self.array.dtype:
+            dtype = np.result_type(self.array, chunk) if chunk.dtype.kind in "iuf" and self.array.dtype.kind in "iuf" else object
+            if dtype != self.array.dtype:
+                self.array = self.array[:self.size].astype(dtype)
+        if end > len(self.array):
+            self.array.resize(max(end, len(self.array) * 3 // 2), refcheck = False)
+        self.array[self.size:end] = chunk
+        self.size = end
+
+    def finish(self) -> np.ndarray:
+        "The column, the buffer is emptied"
+        array, self.array = self.array, None
+        if array is None:
+            return np.empty(0)
+        array.resize(self.size, refcheck = False)
+        return array
+
+
+class cell_store:
+    """
+    Column store for the cells of the titles or the tabular.
+
+    Every column is kept as its own 1D-array, numeric columns keep their dtype.
+    Cells that do not fit the dtype of their column, multicolumns, multirows and the
+    spacers covering the cells under them are kept sparsely in one dict per column, {row: object}.
+
+    Cells are read and written with store[row, col].
+    Columns can be views of arrays given by the caller, they are copied before they are first written to.
+    """
+    def __init__(self, columns, special = None, borrowed = ()):
+        self.columns = list(columns)
+        self.special = special if special is not None else [{} for column in self.columns]
+        self.borrowed = set(borrowed) # Columns that are views of arrays the store does not own
+        self.version = 0 # Counts the writes, for caches of things computed from the cells
+
+    @classmethod
+    def from_lists(cls, lists, fill = "", n_rows = None, copy = True) -> "cell_store":
+        """
+        Builds a store from a list of columns, given as lists or arrays.
+        Masked arrays and pyarrow arrays are also accepted, their missing values become fill.
+        Columns shorter than n_rows, by default the longest column, are padded with fill.
+
+        Numeric arrays are used as they are, without copying. With copy = True the store copies
+        such a column before it first writes to it, with copy = False the store owns the arrays given.
+        """
+        if n_rows is None:
+            n_rows = max(map(len, lists), default = 0)
+        columns, special, borrowed = [], [], []
+        for L in lists:
+            L, nulls = column_values(L)
+            column = typed_column(L)
+            pad = n_rows - len(column)
+            if pad and fits(column, fill):
+                column = np.concatenate([column, np.full(pad, fill, dtype=column.dtype)])
+                special.append({})
+            elif pad:
+                column = np.concatenate([column, np.zeros(pad, dtype=column.dtype)])
+                special.append({i: fill for i in range(n_rows - pad, n_rows)})
+            else:
+                if copy and (column is L or not column.flags.owndata):
+                    borrowed.append(len(columns))
+                special.append({})
+            if nulls is not None:
+                special[-1].update({int(i): fill for i in np.flatnonzero(nulls)})
+            columns.append(column)
+        return cls(columns, special, borrowed)
+
+    @classmethod
+    def from_rows(cls, rows) -> "cell_store":
+        "Builds a store of object columns from a list of rows, used for titles"
+        n_cols = max(map(len, rows), default = 0)
+        return cls([object_array([row[j] if j < len(row) else "" for row in rows]) for j in range(n_cols)])
+
+    @property
+    def shape(self) -> tuple:
+        return (len(self.columns[0]) if self.columns else 0, len(self.columns))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _key(self, key):
+        row, col = key
+        rows, cols = self.shape
+        return row % rows if row < 0 else row, col % cols if col < 0 else col
+
+    def __getitem__(self, key):
+        row, col = self._key(key)
+        special = self.special[col]
+        if row in special:
+            return special[row]
+        return self.columns[col][row]
+
+    def __setitem__(self, key, value):
+        row, col = self._key(key)
+        self.version += 1
+        column = self.columns[col]
+        if fits(column, value):
+            if col in self.borrowed:
+                self.columns[col] = column = column.copy()
+                self.borrowed.discard(col)
+            self.special[col].pop(row, None)
+            column[row] = value
+        else:
+            self.special[col][row] = value
+
+    def row(self, i) -> list:
+        "All cells of a row"
+        return [self[i, j] for j in range(len(self.columns))]
+
+    def column(self, j) -> np.ndarray:
+        "All cells of a column as an object array"
+        column = object_array(self.columns[j].tolist())
+        for i, value in self.special[j].items():
+            column[i] = value
+        return column
+
+    def numbers(self, j) -> np.ndarray:
+        "The cells of a column as floats, nan where the cell is not a number"
+        column = self.columns[j]
+        if column.dtype.kind in "iuf":
+            numbers = column.astype(float)
+        else:
+            numbers = np.array([value if isinstance(value, (int, float, np.integer, np.floating))
+                                and not isinstance(value, (bool, np.bool_)) else np.nan for value in column], dtype=float)
+        for i in self.special[j]:
+            numbers[i] = np.nan
+        return numbers
+
+    def expand(self, axis, old, new, values, size):
+        """
+        Spreads the store out over size rows (axis = 0) or columns (axis = 1) in one pass.
+        The existing rows/columns are moved to the positions old and values, one list of cells for
+        each inserted row/column, are placed at the positions new. See layout_plan.
+        """
+        self.version += 1
+        if axis == 1:
+            columns, special = [None] * size, [None] * size
+            for j, column, sp in zip(old, self.columns, self.special):
+                columns[j], special[j] = column, sp
+            for j, L in zip(new, values):
+                inserted = cell_store.from_lists([L], n_rows = len(self), copy = False)
+                columns[j], special[j] = inserted.columns[0], inserted.special[0]
+            self.columns, self.special = columns, special
+            self.borrowed = {int(old[j]) for j in self.borrowed}
+            return
+        for j, column in enumerate(self.columns):
+            expanded = np.zeros(size, dtype = column.dtype)
+            expanded[old] = column
+            special = {int(old[i]): value for i, value in self.special[j].items()}
+            for i, row in zip(new, values):
+                value = row[j] if j < len(row) else ""
+                if fits(expanded, value):
+                    expanded[i] = value
+                else:
+                    special[int(i)] = value
+            self.columns[j], self.special[j] = expanded, special
+        self.borrowed = set()
+
+    def take(self, rows, cols) -> "cell_store":
+        "Copy of the cells in the slices rows and cols"
+        start = rows.indices(len(self))[0]
+        columns = [column[rows].copy() for column in self.columns[cols]]
+        special = [{i - start: v for i, v in sp.items() if i - start in range(len(columns[0]))}
+                   for sp in self.special[cols]] if columns else []
+        return cell_store(columns, special)
+
+    def to_frame(self):
+        "The cells as a pandas DataFrame, for display"
+        return pd.DataFrame({j: pd.Series(self.column(j), dtype = object) for j in range(len(self.columns))})
+
+    def __repr__(self):
+        return repr(self.to_frame())
+
+
+class cell_rules:
+    """
+    Sparse per-cell settings of the tabular, like the formatters or the uncertanties, resolved when they are read.
+
+    Every cell has the default value unless a rule sets it. A rule sets a value for some rows, or every row,
+    of some columns, as one value or one value per row. Rules are kept in the order they were set and later rules win.
+    A rule over every row of a column replaces the older rules and cells of that column,
+    so setting whole columns or the whole tabular again does not add up.
+    Single cells are kept in one dict per column, {row: value}, which win over the rules.
+    Memory grows with the rules and not with the number of cells.
+    """
+    def __init__(self, shape, default, dtype = object):
+        self.n_rows, self.n_cols = shape
+        self.default = default
+        self.dtype = np.dtype(dtype)
+        self.rules = [] # (rows, {col: value}), rows is None for every row or a sorted array of rows
+        self.cells = [{} for j in range(self.n_cols)]
+        self._sorted = None # sorted_cells of self.cells, made by take() for cutting out blocks of rows
+        self.version = 0 # Counts the changes, like cell_store.version
+
+    @property
+    def shape(self) -> tuple:
+        return (self.n_rows, self.n_cols)
+
+    def set(self, value, rows = None, cols = None):
+        """
+        Sets the cells in rows and cols to value.
+
+        Args:
+            value: One value for all the cells or an array broadcastable to (rows, cols).
+            rows (int/slice/list, optional): Rows to set. Defaults to every row.
+            cols (int/slice/list, optional): Columns to set. Defaults to every column.
+        """
+        self._sorted = None
+        self.version += 1
+        cols = np.atleast_1d(np.arange(self.n_cols)[slice(None) if cols is None else cols])
+        if rows is not None:
+            rows = np.unique(np.arange(self.n_rows)[rows])
+        if np.ndim(value) == 0:
+            values = {int(j): value for j in cols}
+        else:
+            block = np.broadcast_to(np.asarray(value, dtype = self.dtype),
+                                    (self.n_rows if rows is None else len(rows), len(cols)))
+            values = {int(j): column[0] if len(column) and (column == column[0]).all() else column.copy()
+                      for j, column in zip(cols, block.T)}
+
+        if rows is None:
+            for _, old_values in self.rules:
+                for j in values:
+                    old_values.pop(j, None)
+            self.rules = [rule for rule in self.rules if rule[1]]
+            for j in values:
+                self.cells[j] = {}
+        elif len(rows) == 1 and all(np.ndim(v) == 0 for v in values.values()):
+            for j, v in values.items():
+                self.cells[j][int(rows[0])] = v
+            return
+        else:
+            for j in values:
+                cells = self.cells[j]
+                if cells:
+                    keys = np.fromiter(cells, dtype = int, count = len(cells))
+                    for i in keys[np.isin(keys, rows)]:
+                        del cells[int(i)]
+        self.rules.append((rows, values))
+
+    def column(self, j, rows = None) -> np.ndarray:
+        "The values of column j in rows, an array of row indices. Defaults to every row"
+        n = self.n_rows if rows is None else len(rows)
+        out = np.full(n, self.default, dtype = self.dtype)
+        for rule_rows, values in self.rules:
+            if j not in values:
+                continue
+            value = values[j]
+            if rule_rows is None:
+                out[:] = value if np.ndim(value) == 0 or rows is None else value[rows]
+                continue
+            if rows is None:
+                out[rule_rows] = value
+                continue
+            pos = np.searchsorted(rule_rows, rows)
+            hit = pos < len(rule_rows)
+            hit[hit] = rule_rows[pos[hit]] == rows[hit]
+            out[hit] = value if np.ndim(value) == 0 else value[pos[hit]]
+        cells = self.cells[j]
+        if cells:
+            if rows is None:
+                for i, value in cells.items():
+                    out[i] = value
+            else:
+                lookup = {int(i): k for k, i in enumerate(rows)}
+                for i, value in cells.items():
+                    if i in lookup:
+                        out[lookup[i]] = value
+        return out
+
+    def __getitem__(self, key):
+        row, col = key
+        return self.column(col, np.array([row]))[0]
+
+    def to_array(self) -> np.ndarray:
+        "Every cell as a 2D-array"
+        array = np.empty(self.shape, dtype = self.dtype)
+        for j in range(self.n_cols):
+            array[:, j] = self.column(j)
+        return array
+
+    def expand(self, axis, old, new, size) -> "cell_rules":
+        """
+        Moves the rules like cell_store.expand. The inserted rows/columns get the default value,
+        also in the columns with rules over every row.
+        """
+        self._sorted = None
+        self.version += 1
+        if axis == 1:
+            moved = {int(j): int(k) for j, k in enumerate(old)}
+            self.rules = [(rows, {moved[j]: v for j, v in values.items()}) for rows, values in self.rules]
+            cells = [{} for j in range(size)]
+            for j, k in moved.items():
+                cells[k] = self.cells[j]
+            self.cells, self.n_cols = cells, size
+            return self
+        rules = []
+        for rows, values in self.rules:
+            if rows is None:
+                for j, v in values.items():
+                    if np.ndim(v):
+                        values[j] = expand(v, 0, old, new, size, self.default)
+            else:
+                rows = old[rows]
+            rules.append((rows, values))
+        self.rules = rules
+        covered = {j for rows, values in rules if rows is None for j in values}
+        self.cells = [{int(old[i]): v for i, v in cells.items()} for cells in self.cells]
+        for j in covered:
+            self.cells[j].update({int(i): self.default for i in new})
+        self.n_rows = size
+        return self
+
+    def take(self, rows, cols) -> "cell_rules":
+        "Copy of the rules of the cells in the slices rows and cols"
+        r0, r1, _ = rows.indices(self.n_rows)
+        c0, c1, _ = cols.indices(self.n_cols)
+        part = cell_rules((r1 - r0, c1 - c0), self.default, self.dtype)
+        for rule_rows, values in self.rules:
+            values = {j - c0: v for j, v in values.items() if c0 <= j < c1}
+            if rule_rows is None:
+                values = {j: v if np.ndim(v) == 0 else v[r0:r1] for j, v in values.items()}
+            else:
+                inside = (rule_rows >= r0) & (rule_rows < r1)
+                values = {j: v if np.ndim(v) == 0 else v[inside] for j, v in values.items()}
+                rule_rows = rule_rows[inside] - r0
+            if values:
+                part.rules.append((rule_rows, values))
+        if self._sorted is None:
+            self._sorted = sorted_cells(self.cells)
+        part.cells = self._sorted.block(r0, r1, slice(c0, c1))
+        return part
+
+    def remap(self, rows, n_rows) -> "cell_rules":
+        """
+        Copy of the rules for a tabular of n_rows rows, where row i is moved to rows[i], an increasing array
+        with -1 for rows that are left out. Rules over every row with one value still cover every row,
+        other values only follow the rows that are kept.
+        """
+        rows = np.asarray(rows)
+        kept = rows >= 0
+        part = cell_rules((n_rows, self.n_cols), self.default, self.dtype)
+        for rule_rows, values in self.rules:
+            if rule_rows is None and all(np.ndim(v) == 0 for v in values.values()):
+                part.rules.append((None, dict(values)))
+                continue
+            if rule_rows is None:
+                moved = {j: v if np.ndim(v) == 0 else v[kept] for j, v in values.items()}
+                part.rules.append((rows[kept], moved))
+                continue
+            inside = kept[rule_rows]
+            moved = {j: v if np.ndim(v) == 0 else v[inside] for j, v in values.items()}
+            part.rules.append((rows[rule_rows[inside]], moved))
+        part.cells = [{int(rows[i]): v for i, v in cells.items() if rows[i] >= 0} for cells in self.cells]
+        return part
+
+    def __repr__(self):
+        return repr(self.to_array())
+
+
+def expand(array, axis, old, new, size, fill) -> np.ndarray:
+    "Spreads a 2D-array out like cell_store.expand, the inserted rows/columns are filled with fill"
+    shape = list(np.shape(array))
+    shape[axis] = size
+    expanded = np.full(shape, fill, dtype = np.asarray(array).dtype)
+    if axis == 0:
+        expanded[old] = array
+    else:
+        expanded[:, old] = array
+    return expanded
+
+
+class layout_plan:
+    """
+    Rows and columns inserted into the titles or the tabular, recorded in order and applied later.
+
+    Recording an insert only appends to a list. When the cells are needed again the inserts are
+    applied in runs of consecutive inserts along the same axis, each run moving every array only once.
+    """
+    def __init__(self):
+        self.edits = []
+
+    def __bool__(self):
+        return bool(self.edits)
+
+    def insert(self, axis, index, values):
+        "Records values inserted as a row (axis = 0) or column (axis = 1) before index"
+        self.edits.append((axis, index, values))
+
+    def apply(self, store, arrays = ()) -> list:
+        """
+        Applies the recorded inserts to store, in place, and to the 2D-arrays or cell_rules in arrays given as (array, fill) pairs.
+
+        Returns:
+            list: The expanded arrays.
+        """
+        arrays = list(arrays)
+        for axis, edits in itertools.groupby(self.edits, key = lambda edit: edit[0]):
+            edits = list(edits)
+            n = store.shape[axis]
+            # Positions of the inserted rows/columns once all inserts of the run are done
+            new = np.empty(len(edits), dtype = int)
+            for k, (_, index, values) in enumerate(edits):
+                if index < 0:
+                    index += n + k
+                before = new[:k]
+                before[before >= index] += 1
+                new[k] = index
+            size = n + len(edits)
+            kept = np.ones(size, dtype = bool)
+            kept[new] = False
+            old = np.flatnonzero(kept)
+            store.expand(axis, old, new, [values for _, _, values in edits], size)
+            arrays = [(array.expand(axis, old, new, size) if isinstance(array, cell_rules)
+                       else expand(array, axis, old, new, size, fill), fill) for array, fill in arrays]
+        self.edits = []
+        return [array for array, fill in arrays]
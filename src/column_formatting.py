@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                            Column formatting engine
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import numpy as np
+from .helper_classes import multicolumn, multicolumn_spacer, multirow, multirow_spacer
+from .helper_functions import count_decimals
+from .cell_store import cell_rules, sorted_cells
+
+# Kinds of cells in a column, worked out once per column before formatting
+NUMERIC, STRING, MULTI, SPACER, OTHER = range(5)
+
+# Place holder for the cell in a formatter, ex. "\\textbf{\x1f}". A formatter without it replaces the cell
+# Not "\0" as numpy drops trailing null characters from strings
+CELL = "\x1f"
+
+_numbers = (int, float, np.integer, np.floating)
+MAX_DECIMALS = 6 # Most decimals infer_precision gives a column
+_type_of = np.frompyfunc(type, 1, 1) # Type of every cell of an object array in one call
+
+
+def cell_kind(obj) -> int:
+    "Classifies a single cell of the tabular"
+    if isinstance(obj, str):
+        return STRING
+    if isinstance(obj, multicolumn_spacer):
+        return SPACER
+    if isinstance(obj, (multicolumn, multirow, multirow_spacer)):
+        return MULTI
+    if isinstance(obj, _numbers):
+        return NUMERIC
+    return OTHER
+
+def classify_column(column) -> np.ndarray:
+    """
+    Returns an array with the kind of each cell in the column.
+    Typed numeric columns are recognised from their dtype without looking at the cells.
+    """
+    column = np.asarray(column)
+    if column.dtype.kind in "iuf":
+        return np.full(len(column), NUMERIC, dtype=np.int8)
+    if column.dtype.kind in "US":
+        return np.full(len(column), STRING, dtype=np.int8)
+    # Object columns hold few types, each is classified once from one of its cells
+    types = _type_of(column)
+    kinds = np.empty(len(column), dtype=np.int8)
+    left = np.ones(len(column), dtype=bool)
+    target = np.empty((), dtype=object) # Compared as an array, a type like pandas' NAType defines __array_ufunc__
+    while left.any():
+        first = int(np.argmax(left))
+        target[()] = types[first]
+        same = types == target
+        kinds[same] = cell_kind(column[first])
+        left &= ~same
+    return kinds
+
+def infer_precision(column, sample: int = None, block: int = 1 << 20):
+    """
+    Infers the number of decimals needed for the numbers in a column.
+    If sample is given only that many evenly spaced elements are looked at.
+    Float columns are read block elements at the time, so memory mapped columns are not loaded at once.
+    Returns None if the column contains no numbers.
+    """
+    column = np.asarray(column)
+    if sample and len(column) > sample:
+        column = column[np.linspace(0, len(column) - 1, sample).astype(int)]
+    if column.dtype.kind in "iu":
+        return 0
+    if column.dtype.kind != "f":
+        column = column[classify_column(column) == NUMERIC]
+        if not len(column):
+            return None
+        return count_decimals(column)
+    decimals = 0
+    for start in range(0, len(column), block):
+        decimals = max(decimals, count_decimals(column[start:start + block], MAX_DECIMALS))
+        if decimals == MAX_DECIMALS:
+            break
+    return decimals
+
+def format_cell(value, precision, error, formatter, lower = np.nan, digits = None) -> str:
+    "Formats a single cell of the tabular. Used for cells the column formatting can not handle"
+    if isinstance(value, (multicolumn, multirow, multirow_spacer)):
+        value = str(value)
+    if isinstance(value, str): # Dont format strings as floats, its bad
+        cell = value
+    elif isinstance(value, _numbers):
+        cell = format_numbers([value], precision, [error], [lower], digits)[0]
+    else:
+        cell = f"{value:.{precision}f}"
+
+    return cell.join(formatter.split(CELL)) if formatter != CELL else cell
+
+def significant_decimals(errors, digits) -> np.ndarray:
+    """
+    Number of decimals that rounds each error to digits significant digits, negative for rounding left of the point.
+    With digits = 'pdg' errors starting with 100-354 get two digits, 355-949 one digit and 950-999 are
+    rounded up to two digits, 0.0097 -> 0.010, as recommended by the Particle Data Group.
+    """
+    errors = np.abs(np.asarray(errors, dtype=float))
+    exponent = np.floor(np.log10(errors)).astype(int)
+    if digits == "pdg":
+        leading = errors / 10.0**(exponent - 2)
+        digits = np.where(leading < 355, 2, 1)
+        rounded_up = leading >= 950
+        digits[rounded_up] = 2
+        exponent[rounded_up] += 1
+    decimals = digits - 1 - exponent
+    # Rounding may carry into a new digit, ex 0.096 -> 0.10 for one digit
+    carried = np.round(errors * 10.0**decimals) >= 10.0**np.asarray(digits)
+    return decimals - carried
+
+def format_numbers(values, precision, errors, lower = None, digits = None) -> np.ndarray:
+    """
+    Formats an array of numbers with a fixed number of decimals.
+    Elements with a non-zero error are written as \\num{value \\pm error},
+    or as $value^{+error}_{-lower}$ where lower is given and not nan.
+
+    If digits is given (1, 2, ... or 'pdg') the errors are rounded to that many significant digits,
+    see significant_decimals, and the values to the same decimal instead of using precision.
+    """
+    fmt = f"%.{precision}f"
+    values = np.asarray(values, dtype=float)
+    errors = np.asarray(errors, dtype=float)
+    cells = np.empty(len(values), dtype=object)
+    cells[:] = [fmt % v for v in values.tolist()]
+
+    uncertain = ~np.isclose(errors, 0)
+    asymmetric = np.zeros(len(values), dtype=bool)
+    if lower is not None:
+        lower = np.asarray(lower, dtype=float)
+        asymmetric = ~np.isnan(lower)
+        uncertain |= asymmetric & ~np.isclose(np.nan_to_num(lower), 0)
+    if not uncertain.any():
+        return cells
+
+    if digits is None:
+        decimals = np.full(len(values), precision)
+    else:
+        # The digits follow the smallest error of a cell
+        smallest = np.abs(errors)
+        if lower is not None:
+            smallest = np.fmin(np.where(smallest > 0, smallest, np.nan), 
+                               np.where(np.abs(lower) > 0, np.abs(lower), np.nan))
+        decimals = np.full(len(values), precision)
+        valid = uncertain & np.isfinite(smallest) & (smallest > 0)
+        decimals[valid] = significant_decimals(smallest[valid], digits)
+        # Round to the left of the decimal point, the rest is rounded when written
+        left = valid & (decimals < 0)
+        scale = 10.0**-decimals[left]
+        values, errors = values.copy(), errors.copy()
+        values[left] = np.round(values[left] / scale) * scale
+        errors[left] = np.round(errors[left] / scale) * scale
+        if lower is not None:
+            lower = lower.copy()
+            lower[left] = np.round(lower[left] / scale) * scale
+        decimals = np.maximum(decimals, 0)
+
+    # One pass for each number of decimals
+    for n in np.unique(decimals[uncertain]):
+        fmt = f"%.{n}f"
+        rows = uncertain & (decimals == n)
+        symmetric = rows & ~asymmetric
+        if symmetric.any():
+            pm = r"\num{" + fmt + r" \pm " + fmt + "}"
+            cells[symmetric] = [pm % pair for pair in zip(values[symmetric].tolist(), errors[symmetric].tolist())]
+        rows &= asymmetric
+        if rows.any():
+            pm = "$" + fmt + "^{+" + fmt + "}_{-" + fmt + "}$"
+            cells[rows] = [pm % triple for triple in zip(values[rows].tolist(), errors[rows].tolist(), 
+                                                         np.abs(lower[rows]).tolist())]
+    return cells
+
+def apply_formatters(cells, formatters) -> np.ndarray:
+    """
+    Applies the formatters to already formatted cells, one pass for each unique formatter.
+    """
+    for formatter in set(formatters.tolist()):
+        if formatter == CELL:
+            continue
+        mask = formatters == formatter
+        # Split the formatter around its place holder
+        parts = formatter.split(CELL)
+        if len(parts) == 2:
+            cells[mask] = parts[0] + cells[mask] + parts[1]
+        elif len(parts) == 1:
+            # No place holder, the formatter replaces the content of the cell
+            cells[mask] = parts[0]
+        else:
+            cells[mask] = [c.join(parts) for c in cells[mask]]
+    return cells
+
+def format_column(values, kinds, precision, errors, formatters, special = {}, lower = None, digits = None) -> np.ndarray:
+    """
+    Formats one column of the tabular into an object array of strings.
+    Numbers and strings are formatted as whole arrays, multicolumns, multirows and other objects cell by cell.
+    special holds cells, {index: object}, that are not stored in values.
+    lower and digits are the lower errors and significant digits of the errors, see format_numbers.
+    """
+    cells = np.empty(len(values), dtype=object)
+    numeric = kinds == NUMERIC
+    if lower is None:
+        lower = np.full(len(values), np.nan)
+    if numeric.all():
+        cells[:] = format_numbers(values, precision, errors, lower, digits)
+        return apply_formatters(cells, formatters)
+
+    if numeric.any():
+        cells[numeric] = apply_formatters(format_numbers(values[numeric], precision, errors[numeric],
+                                                         lower[numeric], digits),
+                                          formatters[numeric])
+    strings = kinds == STRING
+    cells[strings] = values[strings]
+    for i, value in special.items():
+        if strings[i]:
+            cells[i] = value
+    if strings.any():
+        cells[strings] = apply_formatters(cells[strings], formatters[strings])
+    for i in np.flatnonzero(~numeric & ~strings):
+        cells[i] = format_cell(special[i] if i in special else values[i], precision, errors[i], formatters[i],
+                               lower[i], digits)
+    return cells
+
+def local_special(special, rows) -> dict:
+    """
+    Re-keys the special cells of a column, {row: object}, by their position in the sorted array rows.
+    Cells in rows not in the array are left out.
+    """
+    if not special or not len(rows):
+        return {}
+    keys = np.fromiter(special.keys(), dtype=int, count=len(special))
+    pos = np.searchsorted(rows, keys)
+    found = pos < len(rows)
+    found[found] = rows[pos[found]] == keys[found]
+    return {int(p): special[int(k)] for p, k in zip(pos[found], keys[found])}
+
+def format_rows(columns, special, precision, uncertanty, formatters, start = 0, stop = None,
+                lower = None, error_digits = None) -> np.ndarray:
+    """
+    Formats the rows start:stop of the tabular a column at the time.
+
+    Args:
+        columns (list): 1D-arrays holding the columns of the tabular.
+        special (list/sorted_cells): Dicts with the cells of each column not stored in the arrays, {row: object}.
+        Give them as sorted_cells when formatting a table in many blocks.
+        precision (list): Number of decimals for each column.
+        uncertanty (cell_rules): The uncertanty of each cell.
+        formatters (cell_rules): The formatter of each cell.
+        lower (cell_rules, optional): The lower uncertanty of each cell, nan for symmetric uncertanties.
+        error_digits (list, optional): Significant digits of the uncertanties of each column, None for precision.
+
+    Returns:
+        np.array: Object array with the cells of each row joined by '&'.
+    """
+    if stop is None:
+        stop = len(columns[0])
+    special = (special if isinstance(special, sorted_cells) else sorted_cells(special)).block(start, stop)
+    rows, cols = slice(start, stop), slice(None)
+    return body_cache().render([np.asarray(column)[start:stop] for column in columns], special, precision,
+                               uncertanty.take(rows, cols), formatters.take(rows, cols),
+                               None if lower is None else lower.take(rows, cols), error_digits)
+
+
+class body_cache:
+    """
+    Keeps the formatted cells of the tabular between renders.
+
+    Mutations mark the rows and columns they touch with mark(), only those are formatted again on the next render.
+    Structural changes, like new rows or columns, must clear() the cache.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.cells = None # Formatted cells of the regular rows, one array per column
+        self.rows = None # Cells of each row joined by '&'
+        self.dirty_rows = set()
+        self.dirty_cols = set()
+
+    def mark(self, rows = (), cols = ()):
+        "Marks rows and columns, given as lists of indices, as changed"
+        if self.cells is not None:
+            self.dirty_rows.update(rows)
+            self.dirty_cols.update(cols)
+
+    def render(self, columns, special, precision, uncertanty, formatters, lower = None, error_digits = None) -> np.ndarray:
+        """
+        Returns an object array with the cells of each row joined by '&'.
+        Only columns and rows marked since the last call are formatted.
+        special holds the cells of each column that are not stored in its array, see cell_store.
+        See format_rows for the other arguments.
+        """
+        if lower is None:
+            lower = cell_rules(uncertanty.shape, np.nan, float)
+        if error_digits is None:
+            error_digits = [None] * len(columns)
+        if self.cells is None:
+            kinds = [classify_column(column) for column in columns]
+            # Rows containing multicolumns have fewer cells than the others and are formatted cell by cell
+            self.spacer_rows = np.zeros(len(columns[0]), dtype=bool)
+            for kind, sp in zip(kinds, special):
+                for i, value in sp.items():
+                    kind[i] = cell_kind(value)
+                    self.spacer_rows[i] |= kind[i] == SPACER
+            self.regular = np.flatnonzero(~self.spacer_rows)
+            self.kinds = [kind[self.regular] for kind in kinds]
+            self.special = [local_special(sp, self.regular) for sp in special]
+            self.dirty_cols = set(range(len(columns)))
+            self.cells = [None] * len(columns)
+
+        regular = self.regular
+        for j in self.dirty_cols:
+            self.cells[j] = format_column(columns[j][regular], self.kinds[j], precision[j],
+                                          uncertanty.column(j, regular), formatters.column(j, regular), self.special[j],
+                                          lower.column(j, regular), error_digits[j])
+
+        # Changed rows are formatted again in the columns that were not already
+        pos = np.flatnonzero(np.isin(regular, list(self.dirty_rows)))
+        idx = regular[pos]
+        if len(pos):
+            for j, column in enumerate(columns):
+                if j not in self.dirty_cols:
+                    self.cells[j][pos] = format_column(column[idx], self.kinds[j][pos], precision[j],
+                                                       uncertanty.column(j, idx), formatters.column(j, idx),
+                                                       local_special(special[j], idx), lower.column(j, idx), error_digits[j])
+
+        if self.dirty_cols or self.rows is None:
+            self.rows = np.empty(len(columns[0]), dtype=object)
+            if len(regular):
+                self.rows[regular] = self.cells[0]
+                for cells in self.cells[1:]:
+                    self.rows[regular] += " & " + cells
+        elif len(pos):
+            self.rows[idx] = self.cells[0][pos]
+            for cells in self.cells[1:]:
+                self.rows[idx] += " & " + cells[pos]
+
+        for i in np.flatnonzero(self.spacer_rows):
+            row = [sp[i] if i in sp else column[i] for column, sp in zip(columns, special)]
+            row = [value for value in row if not isinstance(value, multicolumn_spacer)]
+            self.rows[i] = " & ".join(format_cell(value, precision[j], uncertanty[i, j], formatters[i, j],
+                                                  lower[i, j], error_digits[j])
+                                      for j, value in enumerate(row))
+        self.dirty_rows, self.dirty_cols = set(), set()
+        return self.rows
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                              Conditional formats
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import numpy as np
+from .column_formatting import CELL
+
+
+class highlight:
+    """
+    Formats the largest or smallest number of each column (axis = 0), of each row (axis = 1)
+    or of the whole tabular (axis = None). Ties are all formatted.
+    """
+    def __init__(self, rule, axis, formatter, cols = None):
+        if rule not in ("max", "min"):
+            raise ValueError(f"Can only highlight 'max' or 'min', not {rule!r}")
+        if axis not in (0, 1, None):
+            raise ValueError(f"axis must be 0 (columns), 1 (rows) or None (all cells), not {axis!r}")
+        self.rule, self.axis, self.formatter, self.cols = rule, axis, formatter, cols
+
+    def mask(self, numbers) -> np.ndarray:
+        "Which of the numbers, a 2D-array with nan for cells that are not numbers, to format"
+        valid = ~np.isnan(numbers)
+        if self.rule == "max":
+            filled = np.where(valid, numbers, -np.inf)
+            best = filled.max(axis = self.axis, keepdims = True, initial = -np.inf)
+        else:
+            filled = np.where(valid, numbers, np.inf)
+            best = filled.min(axis = self.axis, keepdims = True, initial = np.inf)
+        return valid & (filled == best)
+
+class where:
+    """
+    Formats the numbers for which condition is True.
+    The condition is called with one column at the time, as a float array with nan for cells that are not numbers,
+    and returns a bool array. Ex: lambda col: col > 5
+    """
+    def __init__(self, condition, formatter, cols = None):
+        self.condition, self.formatter, self.cols = condition, formatter, cols
+
+    def mask(self, numbers) -> np.ndarray:
+        "Which of the numbers, a 2D-array with nan for cells that are not numbers, to format"
+        mask = np.zeros(numbers.shape, dtype = bool)
+        with np.errstate(invalid = "ignore"):
+            for k, column in enumerate(numbers.T):
+                mask[:, k] = np.broadcast_to(np.asarray(self.condition(column), dtype = bool), column.shape)
+        return mask & ~np.isnan(numbers)
+
+
+def condition_hits(condition, store, numbers) -> dict:
+    """
+    The cells of store that condition formats, as {col: rows} for the columns with any.
+
+    Args:
+        condition (highlight/where): The condition to evaluate.
+        store (cell_store): The cells of the tabular.
+        numbers (dict): The columns of store as floats, {col: array}, shared by the conditions and filled in as needed.
+    """
+    cols = np.atleast_1d(np.arange(store.shape[1])[slice(None) if condition.cols is None else condition.cols])
+    if not len(cols):
+        return {}
+    for j in cols:
+        if j not in numbers:
+            numbers[j] = store.numbers(j)
+    mask = condition.mask(np.column_stack([numbers[j] for j in cols]))
+    return {int(cols[k]): np.flatnonzero(mask[:, k]) for k in np.flatnonzero(mask.any(axis = 0))}
+
+def apply_conditions(hits, formatters):
+    """
+    The formatters of the tabular with the formats of the conditions added as sparse rules.
+    A condition's formatter goes around the formatter the cell already has.
+
+    Args:
+        hits (list): (formatter, {col: rows}) of each condition in the order they were added, see condition_hits.
+        formatters (cell_rules): The formatters set with set_formatters, left unchanged.
+
+    Returns:
+        tuple: The formatters as a new cell_rules and the cells changed by the conditions, {col: {row: formatter}}.
+    """
+    columns = {}
+    for formatter, condition in hits:
+        outer = formatter.split(CELL)
+        for j, rows in condition.items():
+            column = columns.setdefault(j, {})
+            new = [i for i in rows.tolist() if i not in column]
+            if new:
+                column.update(zip(new, formatters.column(j, np.array(new)).tolist()))
+            for i in rows.tolist():
+                column[i] = column[i].join(outer)
+    formatters = formatters.take(slice(None), slice(None))
+    for j, column in columns.items():
+        rows = np.fromiter(column, dtype = int, count = len(column))
+        order = np.argsort(rows)
+        formatters.set(np.array(list(column.values()), dtype = object)[order, None], rows = rows[order], cols = j)
+    return formatters, columns
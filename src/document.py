@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                Document tokens
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+
+def tokens(node):
+    """
+    Generator serializing a document node into strings, in order.
+    Nodes are strings, written as they are, nodes with a tokens() method or iterables of nodes,
+    which can be generators producing the text lazily, ex. the rows of the tabular.
+    """
+    if isinstance(node, str):
+        yield node
+    elif hasattr(node, "tokens"):
+        yield from node.tokens()
+    else:
+        for child in node:
+            yield from tokens(child)
+
+class group:
+    "Children inside {}"
+    def __init__(self, *children):
+        self.children = children
+    def tokens(self):
+        yield "{"
+        yield from tokens(self.children)
+        yield "}"
+
+class option:
+    "Children inside []"
+    def __init__(self, *children):
+        self.children = children
+    def tokens(self):
+        yield "["
+        yield from tokens(self.children)
+        yield "]"
+
+class macro:
+    r"""
+    \name followed by its arguments. Arguments that are not a group or an option are put in a group.
+    Ex: macro("caption", option(), "Text") -> \caption[]{Text}
+    """
+    def __init__(self, name, *args):
+        self.name = name
+        self.args = [arg if isinstance(arg, (group, option)) else group(arg) for arg in args]
+    def tokens(self):
+        yield "\\" + self.name
+        for arg in self.args:
+            yield from arg.tokens()
+
+class environment:
+    r"""
+    \begin{name}args body \end{name}
+    """
+    def __init__(self, name, args = (), body = ()):
+        self.name = name
+        self.args = args
+        self.body = body
+    def tokens(self):
+        yield from macro("begin", self.name, *self.args).tokens()
+        yield from tokens(self.body)
+        yield from macro("end", self.name).tokens()
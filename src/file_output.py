@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                  File output
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import os
+import shutil
+import hashlib
+import threading
+
+
+def new_digest():
+    "The hash used for the content of saved tables"
+    return hashlib.blake2b(digest_size = 16)
+
+def file_digest(path, block = 1 << 20) -> str:
+    "Digest of the content of a file, None if it does not exist"
+    digest = new_digest()
+    try:
+        with open(path, "rb") as file:
+            while chunk := file.read(block):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+class digest_index:
+    """
+    Digests of the tables saved in a directory, kept in a file in the directory.
+
+    Every save appends a line 'digest size mtime_ns path' to the file, the last line of a path is the one used.
+    Appends of single lines do not mix when several processes save into the same directory.
+    An entry is only trusted while the size and mtime of the file are the ones recorded,
+    a file changed by something else is hashed again.
+    """
+    _loaded = {} # Path of the index -> (inode, bytes read, lines read, entries), shared by every table in the process
+    _lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.directory = os.path.dirname(self.path)
+
+    def _entries(self) -> dict:
+        "The entries of the index, only the lines added since the last call are read"
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            self._loaded.pop(self.path, None)
+            return {}
+        with file:
+            inode = os.fstat(file.fileno()).st_ino
+            loaded = self._loaded.get(self.path)
+            if loaded is None or loaded[0] != inode: # New or compacted by another process
+                loaded = (inode, 0, 0, {})
+            inode, offset, n_lines, entries = loaded
+            file.seek(offset)
+            data = file.read()
+        end = data.rfind(b"\n") + 1 # A line being appended by another process is read the next time
+        lines = data[:end].decode().splitlines()
+        for line in lines:
+            digest, size, mtime, key = line.split(" ", 3)
+            entries[key] = (digest, int(size), int(mtime))
+        self._loaded[self.path] = (inode, offset + end, n_lines + len(lines), entries)
+        return entries
+
+    def _key(self, path) -> str:
+        return os.path.relpath(os.path.abspath(path), self.directory)
+
+    def lookup(self, path, stat) -> str:
+        "The recorded digest of path if the file is still as it was when it was recorded"
+        with self._lock:
+            entry = self._entries().get(self._key(path))
+        if entry and entry[1:] == (stat.st_size, stat.st_mtime_ns):
+            return entry[0]
+        return None
+
+    def record(self, path, digest):
+        "Records the digest of path as it is now"
+        stat = os.stat(path)
+        line = f"{digest} {stat.st_size} {stat.st_mtime_ns} {self._key(path)}\n"
+        with self._lock:
+            with open(self.path, "a") as file:
+                file.write(line)
+            entries = self._entries()
+            if self._loaded[self.path][2] > 2 * len(entries) + 100:
+                self._compact(entries)
+
+    def _compact(self, entries):
+        "Rewrites the index with one line per path"
+        temporary = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as file:
+            file.writelines(f"{digest} {size} {mtime} {key}\n" for key, (digest, size, mtime) in entries.items())
+        os.replace(temporary, self.path)
+        stat = os.stat(self.path)
+        self._loaded[self.path] = (stat.st_ino, stat.st_size, len(entries), entries)
+
+
+class atomic_writer:
+    """
+    File-like object writing to a temporary file next to path while hashing what is written.
+
+    commit() moves the temporary file over path, so path never holds a half written table,
+    unless path already has the same content, then path is left untouched and keeps its mtime.
+    The old content is found in the index, if one is given, or by hashing the file.
+    A symlink is followed and the file it points to replaced, keeping the permissions of that file.
+    """
+    def __init__(self, path, index = None):
+        self.path = os.path.realpath(path)
+        self.index = index
+        self.temporary = f"{self.path}.{os.getpid()}.{id(self):x}.tmp"
+        self.digest = new_digest()
+        self.size = 0
+        self.file = open(self.temporary, "wb")
+
+    def write(self, fragment):
+        data = fragment.encode("utf-8")
+        self.digest.update(data)
+        self.size += len(data)
+        self.file.write(data)
+
+    def _unchanged(self, digest) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size != self.size:
+            return False
+        old = self.index.lookup(self.path, stat) if self.index else None
+        return (old or file_digest(self.path)) == digest
+
+    def commit(self) -> bool:
+        """
+        Returns:
+            bool: True if path was written, False if it already had the content.
+        """
+        self.file.close()
+        digest = self.digest.hexdigest()
+        if self._unchanged(digest):
+            os.remove(self.temporary)
+            written = False
+        else:
+            try:
+                shutil.copymode(self.path, self.temporary)
+            except FileNotFoundError:
+                pass
+            os.replace(self.temporary, self.path)
+            written = True
+        if self.index:
+            self.index.record(self.path, digest)
+        return written
+
+    def discard(self):
+        "Removes the temporary file without touching path"
+        self.file.close()
+        if os.path.exists(self.temporary):
+            os.remove(self.temporary)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.discard()
@@ -9,16 +9,24 @@
 -------------------------------------------------------------------------------
 """
 
+import copy
 import numpy as np
-import pandas as pd
-from .helper_functions import format_brackets
 
 
-def remove_spacer(L) -> list:
+def cut_clines(linebreak, start, stop) -> list:
     """
-    Removes multicolumn_spacer and multirow_spacer during formatting.
+    Copies a linebreak list for a table cut down to the columns start:stop.
+    Clines are shifted and clipped to the new columns, clines outside of them are dropped.
     """
-    return list(L[L != multicolumn_spacer()])
+    new_linebreak = []
+    for e in linebreak:
+        if isinstance(e, cline_obj) and not e.string_val:
+            e = copy.copy(e)
+            e.start, e.stop = max(e.start, start + 1) - start, min(e.stop, stop) - start
+            if e.start > e.stop:
+                continue
+        new_linebreak.append(e)
+    return new_linebreak
 
 def is_multi(obj):
     return isinstance(obj, (multicolumn, multicolumn_spacer, multirow, multirow_spacer))
@@ -68,17 +76,85 @@ class cline_obj:
         if self.string_val.endswith("hline"):
             return r" \hline"
         if self.string_val:
-            return fr" \cline¤[{self.string_val}¤] "
+            return fr" \cline{{{self.string_val}}} "
         else:
-            return fr" \cline¤[{self.start}-{self.stop}¤] "
+            return fr" \cline{{{self.start}-{self.stop}}} "
     def shift(self, val):
         self.start += val
         self.stop += val
+    def place(self, start, stop):
+        "Covers the columns [start, stop) after columns were inserted, see span_index"
+        self.start, self.stop = start + 1, stop
     def covered_indicies(self):
         return set(np.arange(self.start - 1, self.stop))
     
     
     
+
+class row_linebreaks:
+    """
+    The linebreak lists of the rows of the titles or the tabular, r"\\" followed by the rules under the row.
+
+    Only the rows with another list than the default are kept, {row: list}, so plain rows take no memory.
+    Indexing a row keeps it, so its list can be changed in place, get() reads a row without keeping it.
+    """
+    def __init__(self, n_rows, rows = None, default = None):
+        self.n_rows = n_rows
+        self.rows = {} if rows is None else rows
+        self.default = [r"\\"] if default is None else default
+
+    def __len__(self):
+        return self.n_rows
+
+    def get(self, i) -> list:
+        "The list of row i, which is not to be changed"
+        return self.rows.get(range(self.n_rows)[i], self.default)
+
+    def __getitem__(self, i) -> list:
+        i = range(self.n_rows)[i]
+        if i not in self.rows:
+            self.rows[i] = list(self.default)
+        return self.rows[i]
+
+    def __setitem__(self, i, linebreak):
+        self.rows[range(self.n_rows)[i]] = linebreak
+
+    def __iter__(self):
+        return (self.get(i) for i in range(self.n_rows))
+
+    def items(self) -> list:
+        "The rows kept, (row, list) sorted by row"
+        return sorted(self.rows.items())
+
+    def insert(self, index, linebreak = None):
+        "Inserts a row at index, 0 to len(self), with linebreak or the default"
+        self.rows = {i + (i >= index): L for i, L in self.rows.items()}
+        self.n_rows += 1
+        if linebreak is not None:
+            self.rows[index] = linebreak
+
+    def reset(self, rows):
+        "Sets the rows back to the default"
+        for i in rows:
+            self.rows.pop(i, None)
+
+    def rendered(self) -> tuple:
+        "The default and the rows kept, {row: str}, as strings"
+        return ("".join([str(e) for e in self.default]),
+                {i: "".join([str(e) for e in L]) for i, L in self.rows.items()})
+
+    def cut(self, start, stop, cols) -> "row_linebreaks":
+        "Copy of the rows start:stop for a table cut down to the columns cols[0]:cols[1], see cut_clines"
+        return row_linebreaks(stop - start, {i - start: cut_clines(L, *cols) for i, L in self.rows.items()
+                                             if start <= i < stop}, cut_clines(self.default, *cols))
+
+    def remap(self, moved, n_rows, cols) -> "row_linebreaks":
+        "Copy with row i moved to moved[i] for a table of n_rows rows and cols columns, rows moved to -1 are dropped"
+        return row_linebreaks(n_rows, {int(moved[i]): cut_clines(L, 0, cols) for i, L in self.rows.items()
+                                       if moved[i] >= 0}, list(self.default))
+    
+    
+    
         
 class multicolumn:
     def __init__(self, starting_idx, span, content, clines = False, alignment = "c"):
@@ -99,22 +175,33 @@ class multicolumn:
         self.start_idx += val
         if isinstance(self.cline, cline_obj):
             self.cline.shift(val)
+
+    def place(self, start, stop):
+        "Covers the columns [start, stop) after columns were inserted, see span_index"
+        self.start_idx, self.span = start, stop - start
             
     def __str__(self):
-        return format_brackets(rf"\multicolumn¤[{self.span}¤]¤[{self.alignment}¤]¤[{self.content}¤]")
+        return rf"\multicolumn{{{self.span}}}{{{self.alignment}}}{{{self.content}}}"
     
     
     
     
     
 class multirow:
-    def __init__(self, starting_idx, span, content):
+    def __init__(self, starting_idx, span, content, upward = False):
         self.span = span
         self.content = content
         self.start_idx = starting_idx
+        # Placed in the last row it covers, LaTeX draws a negative span upwards from it
+        self.upward = upward
         
     def shift(self, val):
         self.start_idx += val
+
+    def place(self, start, stop):
+        "Covers the rows [start, stop) after rows were inserted, see span_index"
+        self.span = stop - start
         
     def __str__(self):
-        return format_brackets(rf"\multirow¤[{self.span}¤]¤[*¤]¤[{self.content}¤]")
\ No newline at end of file
+        span = -self.span if self.upward else self.span
+        return rf"\multirow{{{span}}}{{*}}{{{self.content}}}"
\ No newline at end of file
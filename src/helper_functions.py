@@ -9,46 +9,93 @@
 ===============================================================================
 -------------------------------------------------------------------------------
 """
+import re
+import importlib
 import numpy as np
-import pandas as pd
+
+class lazy_import:
+    """Stand-in for a module that is imported the first time one of its attributes is used.
+    Keeps heavy optional imports, like pandas, out of the import of the package."""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
 
 def make_table_row(L: list, linebreak: str) -> str:
     "Writes a table row from a list/array"
-    return ("{} " + r"& {} " * (len(L) - 1) +  linebreak).format(*L)
+    return " & ".join(map(str, L)) + " " + linebreak
+
+def count_decimals(values, max_decimals: int = 6) -> int:
+    """Finds the smallest number of decimals needed to write every finite number in values, at most max_decimals.
+    Works on the numbers directly instead of their string representation."""
+    values = np.asarray(values)
+    if values.dtype.kind != "f":
+        values = values.astype(float)
+    values = values[np.isfinite(values)]
+    # Rounded in their own precision, ex. float32 0.1 is as close to 0.1 as float32 gets
+    rtol = max(1e-12, 4 * np.finfo(values.dtype).eps)
+    for decimals in range(max_decimals):
+        # Only the numbers not yet represented are checked against the next decimal
+        values = values[~np.isclose(np.round(values, decimals), values, rtol=rtol, atol=0)]
+        if not len(values):
+            return decimals
+    return max_decimals
+
+def typed_column(column) -> np.ndarray:
+    """Converts a column to a numeric array if all elements are numbers, otherwise to an object array.
+    Strings are never converted to numbers."""
+    try:
+        typed = np.asarray(column)
+        if typed.ndim == 1 and typed.dtype.kind in "iufO":
+            return typed
+    except ValueError:
+        pass # Ragged elements
+    # Keep the elements as they are, np.fromiter does not unpack tuples into more dimensions
+    return np.fromiter(column, dtype=object, count=len(column))
 
-def format_brackets(string):
-    """As {} is used by the python string formatter '¤[' and '¤]' are used insted. 
-    This function replaces '¤[' and '¤]' with {} for use in Latex"""
-    return string.replace("¤]", "}").replace("¤[", "{")
+def split_alignment(alignment: str) -> tuple:
+    """Splits a tabular alignment string into one string per column, including any '|' in front of it.
+    Returns the column strings and whatever trails the last column. Ex '|l|c|' -> (['|l', '|c'], '|')"""
+    columns = re.findall(r"\|*(?:[pmb]\{[^}]*\}|[a-zA-Z])", alignment)
+    return columns, alignment[len("".join(columns)):]
 
 def latex_formatter(macros:list, targets:list) -> list:  
     """Apply a list of string representing latex macros to a list of text strings.
 
+    The macros are put together into one template, ex. ['textbf', 'ul'] -> \\ul{\\textbf{...}},
+    that is applied to every target in a single pass. Targets that are falsy, like '' or 0, become ''.
+
     Args:
         macros (list/str): A string or list of strings representing latex macros without closed '{}'. Backslash '\' is optional.
-        targets (list): A list of text strings.
+        targets (list): A list of text strings. 2D-arrays and pandas Series are also accepted.
 
     Returns:
-        list: List of text strings now given to the macros as arguments.
+        list: Array of text strings, of the same shape as targets, now given to the macros as arguments.
     """    
-    @np.vectorize
-    def apply_formatter(obj, formatter):
-        if obj:
-            return fr"{formatter}¤[{obj}¤]"
-        else:
-            return ""
-    # Vectorize function to avoid loops
-    vec_format_brackets = np.vectorize(format_brackets)
-    apply_formatter
-    backslash = "\string"[0] # Define a single backslash cos strings are dumb
+    backslash = "\\"
     
     # Case if only one string is given
     if isinstance(macros, str):
         macros = [macros]
         
+    # Compile the macros into the text in front of and behind the target, the first macro innermost
+    prefix, suffix = "", ""
     for form in macros:
         # Check if a backslash is already there
         if not form.startswith(backslash):
             form = backslash + form
-        targets = apply_formatter(targets, form)
-    return vec_format_brackets(targets)
\ No newline at end of file
+        prefix, suffix = form + "{" + prefix, suffix + "}"
+
+    # Lists are kept as objects, as numpy would turn [0, 'a'] into strings
+    targets = np.asarray(targets) if hasattr(targets, "dtype") else np.asarray(targets, dtype=object)
+    if targets.dtype.kind in "iuf":
+        # Numbers are written by numpy, 0 is falsy
+        formatted = np.full(targets.shape, "", dtype=object)
+        nonzero = targets != 0
+        formatted[nonzero] = prefix + targets[nonzero].astype(str).astype(object) + suffix
+    else:
+        formatted = [prefix + f"{obj}" + suffix if obj else "" for obj in targets.ravel().tolist()]
+    return np.array(formatted, dtype=str).reshape(targets.shape)
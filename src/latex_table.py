@@ -10,10 +10,23 @@
 -------------------------------------------------------------------------------
 """
 
+import os
+import itertools
 import numpy as np
-import pandas as pd
-from .helper_classes import multicolumn, multicolumn_spacer, multirow, multirow_spacer, cline_obj, remove_spacer, is_multi
-from .helper_functions import make_table_row, format_brackets
+from .helper_classes import multicolumn, multicolumn_spacer, multirow, multirow_spacer, cline_obj, is_multi, row_linebreaks
+from .helper_functions import make_table_row, typed_column, split_alignment, lazy_import
+from .cell_store import cell_store, cell_rules, layout_plan, table_columns, column_buffer, sorted_cells
+
+pd = lazy_import("pandas") # Only imported when reading csv-files or printing info
+from .column_formatting import format_rows, infer_precision, body_cache, CELL
+from .document import tokens, option, macro, environment
+from .profiling import profile, profiled, phase
+from . import async_render
+from .file_output import atomic_writer, digest_index
+from . import conditional
+from .parallel_render import render_blocks
+from .template import table_template
+from .span_index import table_spans
 
 class latex_table:
     
@@ -29,6 +42,9 @@ class latex_table:
         1. latex_table(ndarray, column_titles = list, **kwargs)
         Given a single 2D-numpy array, the columns of the array representing the columns in the table.
         'titles' must given as a keyword argument.
+        Structured and record arrays, pyarrow tables and DataFrames can also be given, their field or column
+        names are used as titles unless 'titles' is given. Any object with the buffer protocol is read as an array.
+        Numeric columns are kept as views of the data, not copied. Masked and missing values become nan_char.
         
         2. latex_table(arr_titles, arr_0, arr_1,..., **kwargs)
         Given an arbitrary number of 1D-arrays representing the columns of the table. 
@@ -52,6 +68,10 @@ class latex_table:
     caption: str
         The text placed into \caption{...} of the table.
         
+    infer_sample: int
+        The precision of each column is inferred from the numbers in it.
+        If given, only this many evenly spaced rows are looked at, which keeps construction of huge tables fast.
+        
     **kwargs:
         Key-word arguments passed to the set_options method. See set_options for valid kwargs.
         
@@ -68,6 +88,7 @@ class latex_table:
     =======
     """
     table_path = "" # Static path to the directory where tables are saved
+    digest_index = None # Name of a file in table_path keeping the digests of the saved tables, ex. ".table_digests"
     
     
     """
@@ -76,7 +97,9 @@ class latex_table:
     =======
     """
             
-    def __init__(self, *data, titles: list = [], label: str = "", caption: str = "", **kwargs) -> "latex_table":  
+    @profiled("construct")
+    def __init__(self, *data, titles: list = [], label: str = "", caption: str = "",
+                 infer_sample: int = None, **kwargs) -> "latex_table":  
         
         # Check if nan_character is given to be used in the default arrays
         # Can probablly be done better
@@ -93,66 +116,211 @@ class latex_table:
             if titles:
                 # If titles are specific the first array is no longer the title array
                 data_lists = data
-                titles = [pd.Series(titles)]
-                self.titles = pd.DataFrame(titles, dtype=object)
             else:
                 data_lists = list(data[1:])
-                titles = [pd.Series(data[0])]
-                self.titles = pd.DataFrame(titles, dtype=object)
-                
-            # Figure out the shape of the tabular
-            self.rows = len(max(data_lists, key = len)) # Finds the logest sub-list
-            self.cols = len(data_lists)
-            
-            # Initiates an array of the correct shape
-            # This is to allow for subarrays of different length
-            # The empty elements are filled with nan_char
-            temp_data = np.full((self.cols, self.rows), nan_char, dtype=object)
-            # Fill default list
-            for i,L in enumerate(data_lists):
-                temp_data[i][:len(L)] = L
-            self.data = pd.DataFrame(temp_data.T) # Transpose so the data looks correct
+                titles = data[0]
             
         elif isinstance(data[0], dict):
             # Extract keys as the title-array
-            self.titles = pd.DataFrame(list(data[0].keys()), dtype = object)
+            titles = data[0].keys()
             # Values set as the data array
             data_lists = list(data[0].values())
             
-            # Figure out the shape of the tabular
-            self.rows = len(max(data_lists, key = len)) # Finds the logest sub-list
-            self.cols = len(data_lists)
-            
-            # Initiates an array of the correct shape
-            # This is to allow for subarrays of different length
-            # The empty elements are filled with nan_char
-            temp_data = np.full((self.cols, self.rows), nan_char, dtype=object)
-            # Fill default list
-            for i,L in enumerate(data_lists):
-                temp_data[i][:len(L)] = L
-            self.data = pd.DataFrame(temp_data.T) # Transpose so the data looks correct
-            
         else:
+            # Structured arrays, pyarrow tables and DataFrames have their own titles
+            names, data_lists = table_columns(data[0])
+            if not titles:
+                titles = names
             if not titles: # Title must be specified when giving one array as blob
                 raise ValueError("titles= must be specified as a"+
                                  " keyword when giving a single data array")
-            self.data = pd.DataFrame(data[0])
-            self.titles = pd.DataFrame([pd.Series(list(titles))], dtype = object)
-
-            self.rows, self.cols  = self.data.shape
         
-        if len(self.titles[0]) != self.cols and False:
-            raise AssertionError(f"The length of title array, {len(self.titles) }, "
-                                 f"does not match the number of columns, {self.cols}"
-                                 f"\nAttempted title array: {self.titles}")
+        # Every column is kept as a typed array, numeric arrays are used without copying
+        # Columns shorter than the longest and missing values are filled with nan_char
+        self._layout = {"title": layout_plan(), "tabular": layout_plan()}
+        self.data = cell_store.from_lists(data_lists, fill = nan_char)
+        self.titles = cell_store.from_rows([list(titles)])
+        self.rows, self.cols = self.data.shape
         
-        # Set defaults
-        self.uncertanty = np.zeros_like(self.data)
-        self.formatters = np.full_like(self.data, "{}", dtype=object)
+        self._set_defaults(nan_char, label, caption)
+                
+        # Infer the number of decimals of each column from the numbers
+        with phase(self, "infer_precision"):
+            for i in range(self.cols):
+                decimals = infer_precision(self.data.columns[i], infer_sample)
+                if decimals is not None:
+                    self.format_options["precision"][i] = decimals
+
+        self.set_options(**kwargs)
+
+    @classmethod
+    def from_iterable(cls, rows, titles: list = [], label: str = "", caption: str = "",
+                      chunk_rows: int = 10000, **kwargs) -> "latex_table":
+        """Creates a table from an iterable of rows, ex. a generator or a csv.reader.
+
+        The rows are consumed chunk_rows at the time and stored as typed columns,
+        the precision of each column is inferred chunk by chunk.
+
+        Args:
+            rows (iterable): Rows of the table. If titles is empty the first row is used as titles.
+            titles (list, optional): Column titles.
+            chunk_rows (int, optional): Number of rows read at the time. Defaults to 10000.
+            **kwargs: Passed to set_options. See set_options for valid kwargs.
+        """
+        nan_char = kwargs.get("nan_char", r"\,")
+        rows = iter(rows)
+        if not titles:
+            first = next(rows, None)
+            if first is None:
+                raise ValueError("No data given")
+            titles = list(first)
+        width = len(titles)
+
+        def chunks():
+            while chunk := list(itertools.islice(rows, chunk_rows)):
+                if max(map(len, chunk)) > width:
+                    raise ValueError(f"A row is longer than the number of titles, {width}")
+                # Short rows are padded with nan_char
+                yield [[row[j] if j < len(row) else nan_char for row in chunk] for j in range(width)]
+
+        return cls._from_chunks(chunks(), titles, nan_char, label, caption, **kwargs)
+
+    @classmethod
+    def from_csv(cls, buf, titles: list = [], label: str = "", caption: str = "",
+                 chunk_rows: int = 100000, csv_kwargs: dict = None, **kwargs) -> "latex_table":
+        """Creates a table from a csv-file read chunk_rows rows at the time.
+
+        The columns are kept typed and the precision of each column is inferred chunk by chunk.
+        Missing values are replaced by nan_char.
+
+        Args:
+            buf (str/path/file): The csv-file.
+            titles (list, optional): Column titles. Defaults to the header of the file.
+            chunk_rows (int, optional): Number of rows read at the time. Defaults to 100000.
+            csv_kwargs (dict, optional): Key-word arguments passed to pandas.read_csv.
+            **kwargs: Passed to set_options. See set_options for valid kwargs.
+        """
+        nan_char = kwargs.get("nan_char", r"\,")
+
+        def columns(chunk):
+            L = []
+            for j in range(chunk.shape[1]):
+                column = chunk.iloc[:, j]
+                missing = column.isna().to_numpy()
+                column = column.to_numpy()
+                if missing.any():
+                    column = column.astype(object)
+                    column[missing] = nan_char
+                L.append(column)
+            return L
+
+        with pd.read_csv(buf, chunksize=chunk_rows, **(csv_kwargs or {})) as reader:
+            first = next(reader, None)
+            if first is None:
+                raise ValueError("No data given")
+            if not titles:
+                titles = list(first.columns)
+            chunks = map(columns, itertools.chain([first], reader))
+            return cls._from_chunks(chunks, titles, nan_char, label, caption, **kwargs)
+
+    @classmethod
+    def from_npy(cls, path, titles: list = [], label: str = "", caption: str = "", mmap_mode: str = "r",
+                 key: str = None, chunk_rows: int = 10000, **kwargs) -> "latex_table":
+        """Creates a table from a .npy-file, kept memory mapped, or a .npz-file.
+
+        The columns are views of the memory mapped array, nothing is loaded when the table is made
+        except while inferring the precision, which reads the columns a block at the time
+        (give infer_sample to only read a sample). The tabular is rendered chunk_rows rows at the time,
+        see the option chunk_rows, so only the pages of the rows being formatted are in memory,
+        save() writes the file a block at the time.
+
+        Arrays in a .npz-file are not memory mapped by numpy, key selects one of them to use as the data.
+        Without key every array in the file is a column, with the names of the arrays as titles.
+
+        Args:
+            path (str/path): The .npy or .npz-file. 2D, 1D or structured arrays, see the constructor.
+            titles (list, optional): Column titles. Required unless the array has field names or a .npz-file is given.
+            mmap_mode (str, optional): Passed to numpy.load. Defaults to 'r', None loads the array into memory.
+            key (str, optional): The array to use in a .npz-file.
+            chunk_rows (int, optional): Rows formatted at the time. Defaults to 10000.
+            **kwargs: Passed to the constructor.
+        """
+        loaded = np.load(path, mmap_mode = mmap_mode, allow_pickle = False)
+        if isinstance(loaded, np.lib.npyio.NpzFile):
+            with loaded:
+                if key is not None:
+                    data = (loaded[key],)
+                else:
+                    data = (titles or list(loaded.files), *[loaded[name] for name in loaded.files])
+                    titles = []
+        else:
+            data = (loaded,)
+        return cls(*data, titles = titles, label = label, caption = caption, chunk_rows = chunk_rows, **kwargs)
+
+    @classmethod
+    def _from_chunks(cls, chunks, titles, nan_char, label, caption, **kwargs) -> "latex_table":
+        """
+        Builds a table from an iterable of chunks, each chunk being a list of columns.
+        Each chunk is written into one typed array per column as it comes in, see column_buffer.
+        """
+        table = cls.__new__(cls)
+        with phase(table, "construct"):
+            buffers = [column_buffer() for i in titles]
+            precision = [0] * len(titles)
+            for chunk in chunks:
+                for j, column in enumerate(chunk):
+                    column = typed_column(column)
+                    buffers[j].append(column)
+                    # Infer the precision as the chunks come in
+                    with phase(table, "infer_precision"):
+                        decimals = infer_precision(column)
+                    if decimals is not None:
+                        precision[j] = max(precision[j], decimals)
+            if not buffers or not buffers[0].size:
+                raise ValueError("No data given")
+
+            table._layout = {"title": layout_plan(), "tabular": layout_plan()}
+            table.data = cell_store.from_lists([buffer.finish() for buffer in buffers], copy = False)
+            table.titles = cell_store.from_rows([list(titles)])
+            table.rows, table.cols = table.data.shape
+            table._set_defaults(nan_char, label, caption)
+            table.format_options["precision"] = precision
+            table.set_options(**kwargs)
+        return table
+
+    @staticmethod
+    def profile(memory: bool = True):
+        """Context manager recording wall time, calls and tracemalloc peaks of the phases of every table 
+        built, rendered or saved inside it: construct, infer_precision, titles, body and write.
+
+        Args:
+            memory (bool, optional): Trace memory with tracemalloc, slows everything down. Defaults to True.
+
+        Ex:
+            with latex_table.profile() as report:
+                table = latex_table(...)
+                table.save("table")
+            print(report) # Added up over all tables
+            report.as_dict() # Per table and in total, see profile_report
+        """
+        return profile(memory)
+
+    def _set_defaults(self, nan_char, label, caption):
+        """
+        Sets the default options and backend arrays once the data and titles are in place.
+        """
+        self.uncertanty = cell_rules(self.data.shape, 0.0, float)
+        self.uncertanty_lower = cell_rules(self.data.shape, np.nan, float) # nan for symmetric uncertanties
+        self.uncertanty_relative = cell_rules(self.data.shape, False, bool) # Uncertanties relative to the values
+        self.formatters = cell_rules(self.data.shape, CELL)
+        self.conditions = [] # Conditional formats added with highlight() and where(), evaluated when rendering
         self.format_options = {"style" : "booktabs",
                                "nan_char" : nan_char,
                                "precision" : [6] * self.cols,
-                               "multicol_alignment": "c"}
+                               "error_digits": [None] * self.cols,
+                               "multicol_alignment": "c",
+                               "environment": "table",
+                               "chunk_rows": None}
         
         self.table_options = {"caption" : caption,
                         "label" : f"tab:{label}",
@@ -160,62 +328,383 @@ class latex_table:
                         "alignment" : "c" * self.cols,
                         "position_float": r"\centering"}
         
-        self.linebreaks = {"title" : [[r"\\"] for i in range(len(self.titles))],
-                           "tabular": [[r"\\"] for i in range(self.rows)]}
-        
-                
-        for i, column in enumerate(self.data.to_numpy().T):
-            most_decialms = min(np.array(column, dtype = str)) # Convert to strings and find smallest value
-            # Handle floats that are ints and ints, must use the any-loop to handle int and str the same list
-            if most_decialms.endswith(".0") or any(isinstance(element, int) for element in column):
-                self.format_options["precision"][i] = 0
-            else:
-                # If something throws, ignore and dont change
-                try:
-                    decimal_points = len(most_decialms.split(".")[1]) # Insolate decimals
-                    if not isinstance(decimal_points, int):
-                        # If something borks in the prevoius ex. return None, throw something
-                        raise ValueError
-                    self.format_options["precision"][i] = decimal_points
-                except:
-                    pass
-            
+        self.linebreaks = {"title" : row_linebreaks(len(self.titles)), "tabular": row_linebreaks(self.rows)}
+        # Where the rows and columns added by make_multicolumn and make_multirow are, the others hold the data given
+        self._added = {"rows": np.empty(0, dtype=int), "cols": np.empty(0, dtype=int)}
+        # Where the multicolumns, multirows and clines are, for finding collisions without looking at the cells
+        self._spans = {"title": table_spans(), "tabular": table_spans()}
+        self._reset_cache()
 
-        self.set_options(**kwargs)
-        
+    def _reset_cache(self):
+        """
+        Creates empty caches for the rendered titles, cells of the tabular and linebreaks.
+        """
+        self._title_cache = None
+        self._body_cache = body_cache()
+        self._linebreak_cache = None
+        self._conditioned = {} # Formatters of the cells changed by the conditions at the last render, {col: {row: str}}
+        self._condition_cache = {} # The cells hit by each condition and the formatters composed from them
 
-        
-    def save(self, buf, abspath = False):
+    def _invalidate(self, titles = True, tabular = True):
+        """
+        Drops cached renders after a structural change of the titles and/or the tabular.
+        The linebreaks are always rendered again.
+        """
+        if titles:
+            self._title_cache = None
+        if tabular:
+            self._body_cache.clear()
+        self._linebreak_cache = None
+
+    """
+    =======
+    Layout
+    =======
+    Rows and columns inserted by make_multicolumn and make_multirow are recorded in a layout_plan
+    and only applied to the cells, formatters and uncertanties the next time they are used.
+    """
+    @property
+    def data(self) -> cell_store:
+        "Cells of the tabular"
+        self._apply_layout()
+        return self._data
+
+    @data.setter
+    def data(self, store):
+        self._data = store
+
+    @property
+    def titles(self) -> cell_store:
+        "Cells of the titles"
+        if self._layout["title"]:
+            self._layout["title"].apply(self._titles)
+        return self._titles
+
+    @titles.setter
+    def titles(self, store):
+        self._titles = store
+
+    @property
+    def formatters(self) -> cell_rules:
+        self._apply_layout()
+        return self._formatters
+
+    @formatters.setter
+    def formatters(self, array):
+        self._formatters = array
+
+    @property
+    def uncertanty(self) -> cell_rules:
+        self._apply_layout()
+        return self._uncertanty
+
+    @uncertanty.setter
+    def uncertanty(self, array):
+        self._uncertanty = array
+
+    @property
+    def uncertanty_lower(self) -> cell_rules:
+        self._apply_layout()
+        return self._uncertanty_lower
+
+    @uncertanty_lower.setter
+    def uncertanty_lower(self, array):
+        self._uncertanty_lower = array
+
+    @property
+    def uncertanty_relative(self) -> cell_rules:
+        self._apply_layout()
+        return self._uncertanty_relative
+
+    @uncertanty_relative.setter
+    def uncertanty_relative(self, array):
+        self._uncertanty_relative = array
+
+    def _apply_layout(self):
+        "Applies the recorded inserts to the tabular and its backend arrays"
+        if self._layout["tabular"]:
+            self._formatters, self._uncertanty, self._uncertanty_lower, self._uncertanty_relative = \
+                self._layout["tabular"].apply(self._data, [(self._formatters, CELL), (self._uncertanty, 0),
+                                                           (self._uncertanty_lower, np.nan),
+                                                           (self._uncertanty_relative, False)])
+
+    @staticmethod
+    def _indices(idx, n) -> np.ndarray:
+        "Turns an int, slice or list of indices into an array of positive indices"
+        return np.atleast_1d(np.arange(n)[idx])
+
+    def save(self, buf, abspath = False, stream = False, jobs: int = 1):
         """
         Saves the table to a file
-        
-        Use the static class variable *latex_table.table_path* at the beginning of the script 
+
+        Use the static class variable *latex_table.table_path* at the beginning of the script
         to select a common destination that is not the working directory for all tables.
-        
+
         If abspath = False .tex is added automatically
-        
+
+        If stream = True, or the option chunk_rows is set, the table is written a block of rows at the time
+        instead of being built in memory first. With jobs > 1 the rows are formatted in parallel, see render.
+
+        The table is written to a temporary file and moved in place when done. If the file already
+        has the same content it is not touched, so its mtime does not trigger a new build of the document.
+        The old content is compared by hashing the file, or by looking up its digest
+        in *latex_table.digest_index* if that is set.
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged.
         """
+        with atomic_writer(self._path(buf, abspath), self._digest_index()) as file:
+            if stream or self.format_options["chunk_rows"]:
+                self.stream(file, jobs = jobs)
+            else:
+                document = self.render(jobs)
+                with phase(self, "write"):
+                    file.write(document)
+            with phase(self, "write"):
+                return file.commit()
+
+    @staticmethod
+    def _digest_index():
+        "The digest_index in table_path, None if latex_table.digest_index is not set"
+        if latex_table.digest_index is None:
+            return None
+        return digest_index(os.path.join(latex_table.table_path or ".", latex_table.digest_index))
+
+    @staticmethod
+    def _path(buf, abspath) -> str:
+        "The path save() writes to"
+        buf = os.fspath(buf)
         if not abspath:
             buf += ".tex"
         if latex_table.table_path and not abspath:
             buf = latex_table.table_path + buf
-        with open(buf, "w") as file:
-            file.write(self.__str__())
-        file.close()
-    
+        return buf
+
+    async def save_async(self, buf, abspath = False, chunk_rows = 1000, executor = None) -> bool:
+        """
+        Saves the table like save(), without blocking the event loop. Returns True if the file was written.
+
+        The rows are formatted chunk_rows at the time and written as they are done,
+        both in the executor, by default a thread pool shared by all tables. See iter_document_async.
+
+        Ex:
+            await table.save_async("table")
+        """
+        return await async_render.write(self._path(buf, abspath), self.iter_document_async(chunk_rows, executor),
+                                        executor, self._digest_index())
+
+    def iter_document_async(self, chunk_rows = 1000, executor = None):
+        """
+        Async iterator yielding the same pieces as iter_document(), ex. to stream a response.
+        Every piece is made in the executor while the event loop keeps running.
+
+        By default the pieces are made in a thread pool of async_render.max_workers threads shared by all tables,
+        tables iterated at the same time take turns a block of chunk_rows rows at the time.
+        The table must not be changed before the iteration is done.
+
+        Ex:
+            async for fragment in table.iter_document_async():
+                await response.write(fragment)
+        """
+        return async_render.iterate(self.iter_document(chunk_rows), executor)
+
+    def stream(self, buf, chunk_rows = None, jobs = 1):
+        """
+        Writes the table to a file-like object (ex. sys.stdout) or to a path, used as given and written as UTF-8 like save().
+
+        The rows of the tabular are formatted and written chunk_rows at the time
+        so the memory used does not grow with the number of rows.
+        Defaults to the option chunk_rows or 1000. With jobs > 1 the blocks are formatted in parallel, see render.
+        """
+        chunk_rows = chunk_rows or self.format_options["chunk_rows"] or 1000
+        if hasattr(buf, "write"):
+            for fragment in self.iter_document(chunk_rows, jobs):
+                with phase(self, "write"):
+                    buf.write(fragment)
+        else:
+            with open(buf, "w", encoding = "utf-8") as file:
+                self.stream(file, chunk_rows, jobs)
+
+    def iter_document(self, chunk_rows = None, jobs = 1):
+        """
+        Generator yielding the table piece by piece:
+        the preamble, the titles, blocks of chunk_rows rows of the tabular and the closing lines.
+        If chunk_rows and the option chunk_rows are None the tabular is one block, rendered from the cached cells.
+        With jobs > 1 the blocks are formatted in parallel processes, see render.
+        """
+        return tokens(self._document(chunk_rows or self.format_options["chunk_rows"], jobs))
+
+    def render(self, jobs: int = 1) -> str:
+        """
+        The table as a string, like str(table).
+
+        With jobs > 1 the rows of the tabular are formatted in blocks in jobs processes. The numeric columns
+        are shared with the processes through shared memory, or mapped again from their file if they are
+        memory mapped, instead of being pickled. It pays off for large tables only, as starting the processes
+        takes a moment, and the cached cells of the tabular are not used or updated.
+        """
+        return "".join(self.iter_document(jobs = jobs))
+
+    def _document(self, chunk_rows = None, jobs = 1):
+        """
+        The table as a tree of document nodes, see document.py. The tabular is generated when the tree is serialized.
+        """
+        options = self.table_options
+        body = self._iter_table_body(chunk_rows, jobs)
+        if self.format_options["environment"] == "longtable":
+            # The titles are repeated at the top of every page and the pages that continue are closed by the foot,
+            # the last page is closed by the tabular itself
+            titles = self._make_titles()
+            foot = "\\bottomrule\n        " if self.format_options["style"] == "booktabs" else ""
+            return environment("longtable", [option("c"), options["alignment"]], [
+                "\n    ", macro("caption", options["caption"]),
+                "\n    ", macro("label", options["label"]), " \\\\\n        ",
+                titles, "\n        \\endfirsthead\n",
+                "    ", macro("caption", option(), (options["caption"], " (continued)")), " \\\\\n        ",
+                titles, "\n        \\endhead\n        ",
+                foot, "\\endfoot\n        \\endlastfoot\n        ",
+                body, "\n"])
+        
+        return environment("table", [option(options["position"])], [
+            "\n    ", options["position_float"],
+            "\n    ", macro("caption", options["caption"]),
+            "\n    ", macro("label", options["label"]),
+            "\n    ", environment("tabular", [options["alignment"]], [
+                "\n        ", self._make_titles(), "\n        ", body, "\n    "]),
+            "\n"])
+
+    def split(self, rows: int = None, cols: int = None, caption_suffix: str = " ({part}/{parts})") -> list:
+        """Cuts the table into pieces of at most rows rows and cols columns.
+
+        Every piece is a latex_table of its own with the titles of its columns,
+        the caption followed by caption_suffix and the label followed by -part.
+        Multirows and multicolumns may not cross the cuts.
+
+        Args:
+            rows (int, optional): Maximum number of rows in each piece. Defaults to all rows.
+            cols (int, optional): Maximum number of columns in each piece. Defaults to all columns.
+            caption_suffix (str, optional): Added to the caption of each piece. 
+            '{part}' and '{parts}' are replaced by the number of the piece and the number of pieces.
+
+        Returns:
+            list: The pieces, row by row.
+        """
+        row_cuts = list(range(0, self.rows, rows or max(self.rows, 1))) + [self.rows]
+        col_cuts = list(range(0, self.cols, cols or self.cols)) + [self.cols]
+        self._check_cuts(row_cuts[1:-1], col_cuts[1:-1])
+        
+        col_specs, trailing = split_alignment(self.table_options["alignment"])
+        if len(col_specs) != self.cols:
+            col_specs, trailing = ["c"] * self.cols, ""
+        
+        parts = (len(row_cuts) - 1) * (len(col_cuts) - 1)
+        pieces = []
+        for r0, r1 in zip(row_cuts[:-1], row_cuts[1:]):
+            for c0, c1 in zip(col_cuts[:-1], col_cuts[1:]):
+                piece = latex_table.__new__(type(self))
+                piece._layout = {"title": layout_plan(), "tabular": layout_plan()}
+                piece.data = self.data.take(slice(r0, r1), slice(c0, c1))
+                piece.titles = self.titles.take(slice(None), slice(c0, c1))
+                piece.rows, piece.cols = r1 - r0, c1 - c0
+                piece.uncertanty = self.uncertanty.take(slice(r0, r1), slice(c0, c1))
+                piece.uncertanty_lower = self.uncertanty_lower.take(slice(r0, r1), slice(c0, c1))
+                piece.uncertanty_relative = self.uncertanty_relative.take(slice(r0, r1), slice(c0, c1))
+                # The conditions are evaluated on the whole table, not on each piece
+                piece.formatters = self._render_formatters().take(slice(r0, r1), slice(c0, c1))
+                piece.conditions = []
+                piece.format_options = dict(self.format_options, 
+                                            precision = self.format_options["precision"][c0:c1],
+                                            error_digits = self.format_options["error_digits"][c0:c1])
+                piece.table_options = dict(self.table_options,
+                                           caption = self.table_options["caption"] + 
+                                           caption_suffix.format(part = len(pieces) + 1, parts = parts),
+                                           label = f"{self.table_options['label']}-{len(pieces) + 1}",
+                                           alignment = "".join(col_specs[c0:c1]) + trailing)
+                piece.linebreaks = {"title": self.linebreaks["title"].cut(0, len(self.linebreaks["title"]), (c0, c1)),
+                                    "tabular": self.linebreaks["tabular"].cut(r0, r1, (c0, c1))}
+                piece._added = {key: added[(added >= start) & (added < stop)] - start for key, added, start, stop
+                                in [("rows", self._added["rows"], r0, r1), ("cols", self._added["cols"], c0, c1)]}
+                piece._spans = {"title": self._spans["title"].cut((0, len(piece.linebreaks["title"])), (c0, c1),
+                                                                  piece.linebreaks["title"]),
+                                "tabular": self._spans["tabular"].cut((r0, r1), (c0, c1), piece.linebreaks["tabular"])}
+                piece._reset_cache()
+                pieces.append(piece)
+        return pieces
+
+    def render_split(self, rows: int = None, cols: int = None, jobs: int = 1,
+                     caption_suffix: str = " ({part}/{parts})") -> str:
+        """Splits the table with split() and renders the pieces, in parallel processes if jobs > 1.
+        The pieces are returned in order separated by an empty line."""
+        pieces = self.split(rows, cols, caption_suffix)
+        if jobs > 1 and len(pieces) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers = jobs) as executor:
+                rendered = list(executor.map(str, pieces))
+        else:
+            rendered = [str(piece) for piece in pieces]
+        return "\n\n".join(rendered)
+
+    def template(self) -> table_template:
+        """A template with the layout of the table, titles, units, multicolumns, multirows, formatters and options,
+        for rendering new data with the same layout without making the table again.
+        See table_template.
+
+        Ex:
+            template = table.template()
+            new_table = template.bind(new_column_0, new_column_1)
+            template.render(new_array_2d)
+        """
+        return table_template(self)
+
+    def _copy(self, data = None, moved = None) -> "latex_table":
+        """
+        Copy of the table. With data, a cell_store, the tabular is replaced by data and the settings of the rows
+        of the tabular follow moved, the new index of each row or -1, see cell_rules.remap.
+        """
+        table = latex_table.__new__(type(self))
+        table._layout = {"title": layout_plan(), "tabular": layout_plan()}
+        if data is None:
+            data, moved = self.data.take(slice(None), slice(None)), np.arange(self.rows)
+        n_rows = len(data)
+        table.data = data
+        table.titles = self.titles.take(slice(None), slice(None))
+        table.rows, table.cols = data.shape
+        table.uncertanty = self.uncertanty.remap(moved, n_rows)
+        table.uncertanty_lower = self.uncertanty_lower.remap(moved, n_rows)
+        table.uncertanty_relative = self.uncertanty_relative.remap(moved, n_rows)
+        table.formatters = self.formatters.remap(moved, n_rows)
+        table.conditions = list(self.conditions)
+        table.format_options = dict(self.format_options, precision = list(self.format_options["precision"]),
+                                    error_digits = list(self.format_options["error_digits"]))
+        table.table_options = dict(self.table_options)
+        # The clines are copied, they are moved with the columns of the table they are in
+        titles = self.linebreaks["title"]
+        tabular = self.linebreaks["tabular"].remap(moved, n_rows, self.cols)
+        table.linebreaks = {"title": titles.remap(np.arange(len(titles)), len(titles), self.cols), "tabular": tabular}
+        table._added = {key: added.copy() for key, added in self._added.items()}
+        table._spans = {"title": self._spans["title"].remap(np.arange(len(self.linebreaks["title"])),
+                                                            table.linebreaks["title"]),
+                        "tabular": self._spans["tabular"].remap(moved, tabular)}
+        table._reset_cache()
+        return table
+
+    def _check_cuts(self, row_cuts, col_cuts):
+        """
+        Raises if a multirow in the tabular or a multicolumn crosses any of the cuts.
+        """
+        multirows = self._spans["tabular"].multirows
+        for k in multirows.crossing(row_cuts)[:1]:
+            raise ValueError(f"The multirow at rows {multirows.starts[k]}-{multirows.stops[k] - 1}, "
+                             f"column {multirows.lines[k]} crosses a row cut")
+        for target in ("title", "tabular"):
+            multicolumns = self._spans[target].multicolumns
+            for k in multicolumns.crossing(col_cuts)[:1]:
+                raise ValueError(f"The multicolumn at row {multicolumns.lines[k]}, column {multicolumns.starts[k]} "
+                                 f"crosses a column cut")
+
     def __str__(self):
-        return format_brackets(
-r"""\begin¤[table¤][{position}]
-    {position_float}
-    \caption¤[{caption}¤]
-    \label¤[{label}¤]
-    \begin¤[tabular¤]¤[{alignment}¤]
-        {titles}
-        {body}
-    \end¤[tabular¤]
-\end¤[table¤]""".format(titles = self._make_titles(), 
-    body = self._make_table_body(), **self.table_options))
-    
+        return self.render()
+
     """
     =======
     Multicolumn and multirow
@@ -239,12 +728,9 @@ r"""\begin¤[table¤][{position}]
             Defaults to False.
             alignment (str, optional): Sets the alignment of the multicolumn. Defaults to "default".
         """        
-        if target == "title":
-            target_array = self.titles
-        elif target == "tabular":
-            target_array = self.data
-        else:
+        if target not in ("title", "tabular"):
             raise KeyError("Invalid target. Valid targets are 'title'/'tabular'.")
+        self._invalidate(tabular = target == "tabular")
         
         if alignment == "default":
             alignment = self.format_options["multicol_alignment"]
@@ -252,23 +738,30 @@ r"""\begin¤[table¤][{position}]
         new_multicol = multicolumn(start_idx, span, content, clines=cline, alignment=alignment)
         multi_col = [new_multicol] + [multicolumn_spacer()] * (span - 1)
             
+        spans = self._spans[target]
         if insert:
-            old_elements = target_array.iloc[row_idx][start_idx: start_idx + span]
-            for i, e in enumerate(old_elements):
-                if isinstance(e, multicolumn) or isinstance(e, multicolumn_spacer):
-                    raise AssertionError(f"Multicolumns collide at row {row_idx}, column {i + start_idx}"
-                                         f"{self.info(target, (i + start_idx, row_idx))}")
-            
-            new_row = pd.concat([target_array.iloc[row_idx][:start_idx], pd.Series(multi_col), 
-                                target_array.iloc[row_idx][start_idx + span:]], ignore_index=True)
+            target_array = self.titles if target == "title" else self.data
+            row = range(len(self.linebreaks[target]))[row_idx]
+            start = range(self.cols)[start_idx]
+            stop = start + span
+            # Checked before any cell is written so a failed insert leaves the row as it was
+            if span < 1 or stop > self.cols:
+                raise ValueError(f"A multicolumn of span {span} starting at column {start} does not fit "
+                                 f"in the {self.cols} columns of the table")
+            found = spans.multicolumns.find(row, start, stop)
+            if found:
+                col = max(start, found[0])
+                raise AssertionError(f"Multicolumns collide at row {row_idx}, column {col}"
+                                     f"{self.info(target, (row, col))}")
             
-            if target == "title":
-                self.titles.iloc[row_idx] = new_row
-            else:
-                self.data.iloc[row_idx] = new_row
+            for i, e in enumerate(multi_col):
+                target_array[row, start + i] = e
+            spans.multicolumns.add(row, start, stop, new_multicol)
 
             if cline:
                 self.linebreaks[target][row_idx].append(new_multicol.cline)
+                if not new_multicol.cline.string_val:
+                    spans.clines.add(row, start, start + span, new_multicol.cline)
 
         
         else:
@@ -278,10 +771,13 @@ r"""\begin¤[table¤][{position}]
             
             new_row = [""] * front_pad + multi_col + [""] * back_pad
 
-            self._insert(new_row, row_idx, "row", target)
+            row = self._insert(new_row, row_idx, "row", target)
+            spans.multicolumns.add(row, front_pad, front_pad + span, new_multicol)
 
             if cline:
-                self.linebreaks[target][row_idx]= [r"\\", new_multicol.cline]
+                self.linebreaks[target][row]= [r"\\", new_multicol.cline]
+                if not new_multicol.cline.string_val:
+                    spans.clines.add(row, start_idx, start_idx + span, new_multicol.cline)
             
     def make_multirow(self, target:str, column_idx:int, start_idx:int, span:int, content:str,
                       insert:bool = False):
@@ -295,6 +791,7 @@ r"""\begin¤[table¤][{position}]
             content (str): Text to be displayed in the multirow
             insert (bool, optional): If False a new column is inserted with the multirow. If True existing element are erased to fit the multicolumn . Defaults to False.
         """      
+        self._invalidate(tabular = target == "tabular" or not insert)
         if insert:
             if target == "title":
                 target_array = self.titles
@@ -302,69 +799,91 @@ r"""\begin¤[table¤][{position}]
                 target_array = self.data
             else:
                 raise KeyError("Invalid target. Valid targets are 'title'/'tabular'.")
-            old_elements = target_array[column_idx][start_idx: start_idx + span]
-
-            for i, e in enumerate(old_elements):
-                if isinstance(e, multirow) or isinstance(e, multirow_spacer):
-                    raise AssertionError(f"Multirows collide at row {i + start_idx}, column {column_idx}"
-                                         f"{self.info({target}, ({i + start_idx}, {column_idx}))}")
+            # The multirow is placed at start_idx with its spacers in the rows above it
+            top = start_idx - (span - 1)
+            col = range(self.cols)[column_idx]
+            multirows = self._spans[target].multirows
+            found = multirows.find(col, top, start_idx + 1)
+            if found:
+                row = max(top, found[0])
+                raise AssertionError(f"Multirows collide at row {row}, column {column_idx}"
+                                     f"{self.info(target, (row, col))}")
                     
-            new_multirow = [multirow_spacer()] * (span - 1) + [multirow(start_idx, span, content)]
-
-            new_column = pd.concat([target_array[column_idx][:start_idx - (span - 1)], pd.Series(new_multirow), 
-                                    target_array[column_idx][start_idx:]], ignore_index=True)
-            if target == "title":
-                self.titles[column_idx] = new_column
-            elif target == "tabular":
-                self.data[column_idx] = new_column
+            new_multirow = [multirow_spacer()] * (span - 1) + [multirow(start_idx, span, content, upward = True)]
+            for i, e in enumerate(new_multirow):
+                target_array[top + i, column_idx] = e
+            multirows.add(col, top, start_idx + 1, new_multirow[-1])
+            if target == "tabular":
+                self._grid_rules(range(top, start_idx + 1))
             
                 
         else:
-            empty_title_col = ["" for i in range(len(self.titles))]
+            # The number of title rows is taken from the linebreaks so pending inserts are not applied
+            empty_title_col = ["" for i in range(len(self.linebreaks["title"]))]
             empty_tab_col = ["" for i in range(self.rows)]            
             new_multirow = [multirow(start_idx, span, content)] + [multirow_spacer()] * (span - 1)
             if target == "title":
                 top_pad = start_idx - 1 if start_idx > 1 else 0
-                bottom_pad = len(self.titles) - start_idx - span 
+                bottom_pad = len(empty_title_col) - start_idx - span 
                 if bottom_pad < 0: bottom_pad = 0
                 new_column = [""] * top_pad + new_multirow + [""] * bottom_pad
                 
-                self._insert(empty_tab_col, column_idx, "col", title_array=new_column)
+                col = self._insert(empty_tab_col, column_idx, "col", title_array=new_column)
             elif target == "tabular":
                 top_pad = start_idx if start_idx >= 1 else 0
                 bottom_pad = self.rows - start_idx - span 
                 if bottom_pad < 0: bottom_pad = 0
                 new_column = [""] * top_pad + new_multirow + [""] * bottom_pad
-                self._insert(new_column, column_idx, "col", title_array=empty_title_col)
+                col = self._insert(new_column, column_idx, "col", title_array=empty_title_col)
             else:
                 raise KeyError("Invalid target. Valid targets are 'title'/'tabular'.")
+            # The clines after the new column are moved by the insert
+            self._spans[target].multirows.add(col, top_pad, top_pad + span, new_multirow[0])
+            if target == "tabular":
+                self._grid_rules(range(top_pad, top_pad + span))
                 
-            if column_idx != self.cols:
-                idx_set = set()
-                for linebreak_L in self.linebreaks["title"] + self.linebreaks["tabular"]:
-                    idx_set = idx_set | set([c.start - 1 for c in linebreak_L if isinstance(c, cline_obj)])
-                if bool(idx_set) and column_idx <= max(idx_set):
-                    for linebreak_L in self.linebreaks["title"] + self.linebreaks["tabular"]:
-                        for cl in linebreak_L:
-                            if isinstance(cl, cline_obj) and cl.start >= start_idx:
-                                cl.shift(1)
     
     
     
-    def set_uncertanty(self, array, idx = None):
+    def set_uncertanty(self, array, idx = None, lower = None, relative: bool = False, digits = None):
         """Apply uncertnaty to the columns in the tabular.
         
         Args:
             array(list/np.array): Array of uncertanty values. If it spans more than one column idx must be a slice covering those columns. 
             Can be a single value appled to all specified columns.
             idx(int/slice): int or slice specifying which columns to apply the uncertanties in array to. If array has the same shape as the tabular idx can be left out.
+            lower(list/np.array, optional): Lower uncertanties, given like array, for asymmetric uncertanties written as $value^{+array}_{-lower}$.
+            relative(bool, optional): The uncertanties are given relative to the values, ex. 0.05 for 5%,
+            and follow the values when they change. Defaults to False.
+            digits(int/str, optional): Round the uncertanties to this many significant digits and the values to match,
+            or 'pdg' for 1-2 digits by the rule of the Particle Data Group. Sets the 'error_digits' option of the columns.
+            Defaults to None, the option is left as it is.
         """
-        if isinstance(idx, type(None)) and array.shape != (self.cols, self.rows):
-            raise ValueError("")
-        elif isinstance(idx, type(None)):
-            self.uncertanty = array
-        elif isinstance(idx, slice) or isinstance(idx, int):
-            self.uncertanty.T[idx] = array
+        if idx is None:
+            cols = np.arange(self.cols)
+            shapes = [(self.rows, self.cols), (self.cols, self.rows)]
+            if np.shape(array) not in shapes or (lower is not None and np.shape(lower) not in shapes):
+                raise ValueError(f"Without idx the uncertanties must have the shape of the tabular, {shapes[0]}, "
+                                 f"or be given column by column, {shapes[1]}. Given array has shape {np.shape(array)}")
+        else:
+            cols = self._indices(idx, self.cols)
+
+        def by_column(values):
+            "Broadcasts the values to one row per column"
+            values = np.asarray(values, dtype=float)
+            if idx is None and values.shape == (self.rows, self.cols):
+                values = values.T
+            block = np.empty((len(cols), self.rows))
+            block[:] = values
+            return block.T
+
+        self.uncertanty.set(by_column(array), cols = cols)
+        self.uncertanty_lower.set(np.nan if lower is None else by_column(lower), cols = cols)
+        self.uncertanty_relative.set(relative, cols = cols)
+        if digits is not None:
+            for j in cols:
+                self.format_options["error_digits"][j] = digits
+        self._body_cache.mark(cols = cols)
             
 
         
@@ -378,6 +897,90 @@ r"""\begin¤[table¤][{position}]
 
         
         
+    @staticmethod
+    def _format_string(format_string) -> str:
+        "Turns a format given to set_formatters, highlight or where into a formatter, see column_formatting.CELL"
+        common_latex_formats = {"bf" : r"\textbf{}",
+                                "it" : r"\textit{}",
+                                "ul" : r"\ul{}",
+                                "$$" : "$" + CELL + "$"}
+        format_string = common_latex_formats.get(format_string.lower(), format_string)
+        # The cell goes inside every {}
+        return format_string.replace("{}", "{" + CELL + "}")
+
+    def highlight(self, rule = "max", axis = 0, fmt = "bf", cols = None):
+        r"""Formats the largest or smallest number of each column, row or of the whole tabular.
+        The numbers are compared again when the data changes, so the format follows changes of the data.
+        Cells that are not numbers are left out.
+
+        Ex: table.highlight("max", axis = 1, fmt = "bf") # The largest number of each row in bold
+
+        Args:
+            rule (str, optional): 'max' or 'min'. Defaults to 'max'.
+            axis (int, optional): 0 for each column, 1 for each row, None for the whole tabular. Defaults to 0.
+            fmt (str, optional): Format like in set_formatters, ex. 'bf', 'it' or r'\color{red}{}'. Defaults to 'bf'.
+            cols (int/slice/list, optional): Columns to compare. Defaults to all columns.
+        """
+        self.conditions.append(conditional.highlight(rule, axis, self._format_string(fmt), cols))
+
+    def where(self, condition, fmt = "bf", cols = None):
+        """Formats the numbers for which condition is True. Evaluated again when the data changes.
+
+        Ex: table.where(lambda col: col > 5, fmt = "it")
+
+        Args:
+            condition (function): Called with each column as a float array, nan for cells that are not numbers,
+            returns a bool array.
+            fmt (str, optional): Format like in set_formatters. Defaults to 'bf'.
+            cols (int/slice/list, optional): Columns to apply the condition to. Defaults to all columns.
+        """
+        self.conditions.append(conditional.where(condition, self._format_string(fmt), cols))
+
+    def _render_formatters(self) -> cell_rules:
+        """
+        The formatters used to render the tabular, with the conditions of highlight() and where() applied.
+        A condition is evaluated when it is added or the data has changed, the formatters are composed again
+        when the cells hit by the conditions or the formatters have changed.
+        Columns whose conditional formatters changed since the last render are marked for the body cache.
+        """
+        if not self.conditions and not self._conditioned:
+            return self.formatters
+        data, formatters, cache = self.data, self.formatters, self._condition_cache
+        if cache.get("data") != (data, data.version):
+            cache.clear()
+            cache["data"], cache["hits"] = (data, data.version), {}
+        hits, numbers = cache["hits"], {}
+        for condition in self.conditions:
+            if id(condition) not in hits: # The condition is kept with its hits so the id is not reused
+                hits[id(condition)] = (condition, conditional.condition_hits(condition, data, numbers))
+        key = (data, data.version, formatters, formatters.version, tuple(self.conditions))
+        if cache.get("key") != key:
+            cache["key"] = key
+            cache["formatters"], conditioned = conditional.apply_conditions(
+                [(condition.formatter, hits[id(condition)][1]) for condition in self.conditions], formatters)
+            old = self._conditioned
+            self._body_cache.mark(cols = [j for j in set(conditioned) | set(old) if conditioned.get(j) != old.get(j)])
+            self._conditioned = conditioned
+        return cache["formatters"]
+
+    def _render_uncertanties(self) -> tuple:
+        """
+        The upper and lower uncertanties used to render the tabular,
+        with the relative uncertanties multiplied by the absolute values of their cells.
+        """
+        relative = self.uncertanty_relative
+        cols = sorted({j for rows, values in relative.rules for j, v in values.items() if np.any(v)} |
+                      {j for j, cells in enumerate(relative.cells) if any(cells.values())})
+        if not cols:
+            return self.uncertanty, self.uncertanty_lower
+        upper = self.uncertanty.take(slice(None), slice(None))
+        lower = self.uncertanty_lower.take(slice(None), slice(None))
+        for j in cols:
+            scale = np.where(relative.column(j), np.abs(np.nan_to_num(self.data.numbers(j))), 1.0)
+            upper.set((upper.column(j) * scale)[:, None], cols = j)
+            lower.set((lower.column(j) * scale)[:, None], cols = j)
+        return upper, lower
+
     def set_formatters(self, format_string, col = "single", row = "single"):
         """Sets format options for the tabular. A latex command like \macro{} will be interpreted as \macro{tabular_cell}. 
         A command can be applied to entire row or column by only indexing one or the other. 
@@ -390,23 +993,14 @@ r"""\begin¤[table¤][{position}]
             col (int/slice, optional): Column index. Defaults to "full".
             row (int/slice, optional): Row index. Defaults to "full".
         """        
-        common_latex_formats = {"bf" : r"\textbf¤[{}¤]",
-                                "it" : r"\textit¤[{}¤]",
-                                "ul" : r"¤[\ul{}¤]",
-                                "$$" : "${}$"}
-        if format_string.lower() in common_latex_formats:
-            format_string = common_latex_formats[format_string]
-        else:
-            format_string = format_string.replace("{}", "¤[¤]").replace(
-            "{", "¤[").replace("}", "¤]").replace("¤[¤]", "¤[{}¤]")
-        if isinstance(col, str) and isinstance(row, str):
-            self.formatters[:,:] = format_string
-        elif isinstance(col, str) and not isinstance(row, str):
-            self.formatters[row,:] = format_string
-        elif not isinstance(col, str) and isinstance(row, str):
-            self.formatters[:,col] = format_string
+        format_string = self._format_string(format_string)
+        rows = None if isinstance(row, str) else row
+        cols = None if isinstance(col, str) else col
+        self.formatters.set(format_string, rows, cols)
+        if rows is None:
+            self._body_cache.mark(cols = self._indices(slice(None) if cols is None else cols, self.cols))
         else:
-            self.formatters[col,row] = format_string
+            self._body_cache.mark(rows = self._indices(rows, self.rows))
             
    
 
@@ -432,7 +1026,10 @@ r"""\begin¤[table¤][{position}]
             'style': 'booktabs',
             'nan_char': r'\,', 
             'precision': [6, 6,..., 6, 6]
+            'error_digits': [None, None,..., None]
             'multicol_alignment': 'c'
+            'environment': 'table'
+            'chunk_rows': None, rows of the tabular formatted at the time by default, None for all at once
         """
         
         for key,item in kwargs.items():
@@ -448,6 +1045,10 @@ r"""\begin¤[table¤][{position}]
                         self.set_style(item)
                     case "precision":
                         self.set_precision(item)
+                    case "error_digits":
+                        self.set_error_digits(item)
+                    case "environment":
+                        self.set_environment(item)
                     case _:
                         self.format_options[key] = item
             else:
@@ -467,18 +1068,19 @@ r"""\begin¤[table¤][{position}]
             raise ValueError(f"The length of the unit array, {len(unit_array)}, "
                              f"must match the number of columns in the table, {self.cols}."
                              "\n\tIf no unit is desired for a column title leave en empty string '' ")
+        self._invalidate(tabular = False)
         half_enc_len = len(encapsulation) // 2
         for i, unit in enumerate(unit_array):
             if unit:
-                if is_multi(self.titles[i][0]):
+                title = self.titles[0, i]
+                unit = encapsulation[:half_enc_len] + fr"\unit{{{unit}}}" + encapsulation[half_enc_len:]
+                if is_multi(title):
                     continue
-                elif not isinstance(self.titles[i][0], str):
+                elif not isinstance(title, str):
                     # If the title element is already a tuple it is extended. * breaks the old tuple
-                    self.titles[i][0] = (*self.titles[i][0], encapsulation[:half_enc_len] + 
-                                  format_brackets(fr"\unit¤[{unit}¤]") + encapsulation[half_enc_len:])
+                    self.titles[0, i] = (*title, unit)
                 else:
-                    self.titles[i][0] = [(self.titles[i][0], encapsulation[:half_enc_len] + 
-                                  format_brackets(fr"\unit¤[{unit}¤]") + encapsulation[half_enc_len:])]
+                    self.titles[0, i] = (title, unit)
 
                     
                     
@@ -489,6 +1091,7 @@ r"""\begin¤[table¤][{position}]
         self.table_options["alignment"] = string
         
     def set_precision(self, new_precision):
+        old_precision = self.format_options["precision"]
         if isinstance(new_precision, int):
             self.format_options["precision"] = [new_precision] * self.cols
         else:
@@ -496,11 +1099,30 @@ r"""\begin¤[table¤][{position}]
                 raise ValueError("A precision must be specified for each column or universally with and int."
                                  f" Current columns: {self.cols}, given array was {len(new_precision)}")
             self.format_options["precision"] = list(new_precision)
+        # Only the columns with a new precision are formatted again
+        self._body_cache.mark(cols = [j for j, (old, new) in enumerate(zip(old_precision, self.format_options["precision"]))
+                                      if old != new])
             
+    def set_error_digits(self, digits):
+        """
+        Number of significant digits, 1, 2, ... or 'pdg', the uncertanties of each column are rounded to, 
+        the values are rounded to match. None writes the uncertanties with the precision of the column.
+        Given for all columns or as a list with one for each column.
+        """
+        if digits is None or isinstance(digits, (int, str)):
+            digits = [digits] * self.cols
+        elif len(digits) != self.cols:
+            raise ValueError("The digits must be specified for each column or universally."
+                             f" Current columns: {self.cols}, given array was {len(digits)}")
+        old_digits = self.format_options["error_digits"]
+        self.format_options["error_digits"] = list(digits)
+        self._body_cache.mark(cols = [j for j, (old, new) in enumerate(zip(old_digits, digits)) if old != new])
+
     def set_style(self, string):
         """
         Change the design of the table to use 'booktabs' or 'grid'
         """
+        self._invalidate(tabular = False)
         match string:
             case "booktabs":
                 self.format_options["style"] = "booktabs"
@@ -509,10 +1131,23 @@ r"""\begin¤[table¤][{position}]
                 self.format_options["multicol_alignment"] = f"{self.format_options['multicol_alignment']}|"
                 # self.table_options["alignment"] = ("|{}" * len(self.table_options["alignment"]) + "|").format(*self.table_options["alignment"])
                 self.table_options["alignment"] = "".join(f"|{c}" for c in self.table_options["alignment"] if c != "|") + "|"
+                # Every row but the ones with multirows continuing has a \hline under it, also the last row
+                linebreaks = self.linebreaks["tabular"]
+                linebreaks.default = [r"\\", cline_obj(string_val="hline")]
                 self._check_lines()
-                self.linebreaks["tabular"][-1].append(" \hline")
+                if self.rows - 1 in linebreaks.rows:
+                    linebreaks[-1].append(r" \hline")
             case _:
                 raise IndexError("Allowed options are 'booktabs' and 'grid'")
+
+    def set_environment(self, string):
+        """
+        Render the table in a 'table' float or as a 'longtable' that breaks over pages 
+        with the titles repeated on every page (requires longtable)
+        """
+        if string not in ("table", "longtable"):
+            raise IndexError("Allowed options are 'table' and 'longtable'")
+        self.format_options["environment"] = string
                 
         
         
@@ -524,21 +1159,27 @@ r"""\begin¤[table¤][{position}]
     """
     def _make_titles(self) -> str:
         """
-        The function that makes the title row for the table
+        The function that makes the title row for the table. Kept until the titles change.
         """
+        if self._title_cache is None:
+            self._title_cache = self._render_titles()
+        return self._title_cache
+
+    @profiled("titles")
+    def _render_titles(self) -> str:
         title_str = ""
 
         def sub_tubular(L):
             """Breaks up a multi-row title into a tabular"""
-            if isinstance(L, list):
-                L = L[0]
             tabular = r"\begin{tabular}{c} "
             for string in L:
                 tabular += (string + r" \\ ")
             return tabular + r"\end{tabular}"
-        for i, title_row in enumerate(self.titles.values):
+        for i in range(len(self.titles)):
             title = []
-            for column_title in remove_spacer(title_row):
+            for column_title in self.titles.row(i):
+                if isinstance(column_title, multicolumn_spacer):
+                    continue
                 if (isinstance(column_title, multicolumn) or 
                     isinstance(column_title, multirow) or 
                     isinstance(column_title, multirow_spacer)):
@@ -548,7 +1189,7 @@ r"""\begin¤[table¤][{position}]
                     title.append(sub_tubular(column_title))
                 else:
                     title.append(str(column_title))
-            linebreak = "".join([str(e) for e in self.linebreaks["title"][i]])
+            linebreak = "".join([str(e) for e in self.linebreaks["title"].get(i)])
             title_str = (make_table_row(title, linebreak) + "\n\t\t") + title_str
 
             
@@ -563,34 +1204,52 @@ r"""\begin¤[table¤][{position}]
         """
         The function that makes the tabular of the table
         """
-        str_data = [] # Data array with all values as strings
-        def format_column_element(i, p, error, formatter):         
-            if isinstance(i, multicolumn) or isinstance(i, multirow) or isinstance(i, multirow_spacer):
-                i = str(i)
-            if isinstance(i, str): # Dont format strings as floats, its bad
-                formatter_string = "{}"
-            elif not np.isclose(error, 0):
-                formatter_string = r"\num¤[{0:.{1}f} \pm {2:.{1}f}¤]"
+        return "".join(self._iter_table_body())
+
+    def _iter_table_body(self, chunk_rows = None, jobs = 1):
+        """
+        Generator yielding the tabular in blocks of chunk_rows rows. All rows at once if chunk_rows is None.
+        With jobs > 1 the blocks are formatted in jobs processes, by default a quarter of the rows of each process at the time.
+        """
+        columns, special = self.data.columns, self.data.special
+        formatters = self._render_formatters()
+        uncertanty, uncertanty_lower = self._render_uncertanties()
+        if not chunk_rows and jobs <= 1 and self.rows:
+            # All rows at once, only what changed since the last render is formatted again
+            with phase(self, "body"):
+                str_rows = self._body_cache.render(columns, special, self.format_options["precision"],
+                                                   uncertanty, formatters, uncertanty_lower,
+                                                   self.format_options["error_digits"])
+                if self._linebreak_cache is None:
+                    default, rendered = self.linebreaks["tabular"].rendered()
+                    self._linebreak_cache = np.full(self.rows, " " + default + "\n\t\t", dtype=object)
+                    for i, linebreak in rendered.items():
+                        self._linebreak_cache[i] = " " + linebreak + "\n\t\t"
+                block = "".join((str_rows + self._linebreak_cache).tolist())
+            yield block
+        elif chunk_rows or jobs > 1:
+            chunk_rows = chunk_rows or max(1, -(-self.rows // (4 * jobs)))
+            precision, error_digits = self.format_options["precision"], self.format_options["error_digits"]
+            if jobs > 1:
+                blocks = render_blocks(columns, special, precision, uncertanty, formatters,
+                                       uncertanty_lower, error_digits, chunk_rows, jobs)
             else:
-                formatter_string = "{0:.{1}f}"
-                
-            return format_brackets(formatter.format(formatter_string.format(i, p , error)))
-            
-        for i, column in enumerate(self.data.values):
-            L = [format_column_element(value, 
-                                       self.format_options["precision"][j], 
-                                       (self.uncertanty)[i][j], 
-                                       (self.formatters)[i][j])
-                 for j, value in enumerate(remove_spacer(column))]
-            str_data.append(L)
-
-        body = "" # String containing the tabluar
-        for i in range(self.rows):
-            linebreak = "".join([str(e) for e in self.linebreaks["tabular"][i]])
-            body += (make_table_row(str_data[i], linebreak) + "\n\t\t") # New row is added 
+                # Format the block a column at the time, rows come back with the cells joined
+                special = sorted_cells(special)
+                blocks = (format_rows(columns, special, precision, uncertanty, formatters, start,
+                                      min(start + chunk_rows, self.rows), uncertanty_lower, error_digits)
+                          for start in range(0, self.rows, chunk_rows))
+            default, rendered = self.linebreaks["tabular"].rendered()
+            for start in range(0, self.rows, chunk_rows):
+                with phase(self, "body"):
+                    str_rows = next(blocks)
+                    block = [] # Rows of the tabluar
+                    for i, row in enumerate(str_rows, start):
+                        block.append(f"{row} {rendered.get(i, default)}\n\t\t") # New row is added
+                    block = "".join(block)
+                yield block
         if self.format_options["style"] == "booktabs":
-            body += r"\bottomrule" # Finishing touches
-        return body
+            yield r"\bottomrule" # Finishing touches
     
     
     
@@ -598,52 +1257,51 @@ r"""\begin¤[table¤][{position}]
     def _insert(self, array, index, axis, target = None, title_array = []):
         """
         Universal insert function. Should only be used internally.
+        The cells are not moved here, the insert is recorded and applied when the cells are next used.
+        Returns the index of the new row or column, counted from the start.
         """
+        self._invalidate()
+        n = self.cols if axis == "col" else len(self.linebreaks[target])
+        position = index + n if index < 0 else index
+        if axis == "col" or target == "tabular":
+            key = "cols" if axis == "col" else "rows"
+            added = self._added[key]
+            added[added >= position] += 1
+            self._added[key] = np.insert(added, np.searchsorted(added, position), position)
+        for spans in self._spans.values() if axis == "col" else [self._spans[target]]:
+            spans.insert(1 if axis == "col" else 0, position)
         if axis == "col": # Change columns
-            new_tabular = self.data.copy()
-            new_title = self.titles.copy()    
-            new_title.insert(index, -1, title_array)
-            new_tabular.insert(index, -1, array) 
+            self._layout["title"].insert(1, index, title_array)
+            self._layout["tabular"].insert(1, index, array)
             
             # Change backend data
-            self.formatters = np.insert(self.formatters, index, "{}", axis=1)
-            self.uncertanty = np.insert(self.uncertanty, index, 0, axis=1)
             self.format_options["precision"].insert(index, 0)
+            self.format_options["error_digits"].insert(index, None)
+            # The new column is aligned like its neighbour, ex. '|c' in the grid style
+            col_specs, trailing = split_alignment(self.table_options["alignment"])
+            if len(col_specs) == self.cols:
+                col_specs.insert(position, col_specs[min(position, self.cols - 1)])
+                self.table_options["alignment"] = "".join(col_specs) + trailing
+            else:
+                self.table_options["alignment"] += self.table_options["alignment"][0]
             self.cols += 1
-            self.table_options["alignment"] += self.table_options["alignment"][0]
-            
-            
-            # Reset index
-            new_tabular.columns = np.arange(len(new_tabular.columns))
-            new_title.columns = np.arange(len(new_title.columns))
-            # Apply new columns
-            self.data = new_tabular
-            self.titles = new_title
             
         elif axis == "row": # Change row
-            new_tabular = self.data.T.copy()
-            new_title = self.titles.T.copy()  
             if target == "title":
-                new_title.insert(index, -1, array)
+                self._layout["title"].insert(0, index, array)
                 
                 # Change backend data
-                self.linebreaks["title"].insert(index, [r"\\"])
+                self.linebreaks["title"].insert(position)
             elif target == "tabular":
-                new_tabular.insert(index, -1, array)    
+                self._layout["tabular"].insert(0, index, array)
                 
                 # Change backend data
-                self.formatters = np.insert(self.formatters, index, "{}", axis=0)
-                self.uncertanty = np.insert(self.uncertanty, index, 0, axis=0)
-                self.linebreaks["tabular"].insert(index, [r"\\"])
+                self.linebreaks["tabular"].insert(position)
 
                 self.rows += 1
-            
-            # Reset index
-            new_tabular.columns = np.arange(len(new_tabular.columns))
-            new_title.columns = np.arange(len(new_title.columns))
-            # Apply new rows
-            self.data = new_tabular.T
-            self.titles = new_title.T
+        if axis == "col" or target == "tabular":
+            self._grid_rules([position - 1, position] if axis == "row" else [])
+        return position
             
     def info(self, exception = False, index = None):
     
@@ -660,18 +1318,13 @@ r"""\begin¤[table¤][{position}]
             else:
                 return i
 
-        show_cpy_tab = self.data.copy()
-        show_cpy_title = self.titles.copy()
-        for col in show_cpy_tab:
-            show_cpy_tab[col] = show_cpy_tab[col].apply(info_format)
-            show_cpy_title[col] = show_cpy_title[col].apply(info_format)
+        show_cpy_tab = self.data.to_frame().map(info_format)
+        show_cpy_title = self.titles.to_frame().map(info_format)
             
-        if exception == "title":
-            show_cpy_title[index[0]][index[1]] = '\033[41m' + str(show_cpy_title[index[0]][index[1]])  + '\033[0m'
-            return("\n" + line + "\nTable Titles:\n" + str(show_cpy_title))
-        if exception == "tabublar":
-            show_cpy_title[index[0]][index[1]] = '\033[41m' + str(show_cpy_title[index[0]][index[1]]) + + '\033[0m'
-            return("\n" + line + "\nTable Tabular:\n" + str(show_cpy_tab))
+        if exception in ("title", "tabular"):
+            shown = (show_cpy_title if exception == "title" else show_cpy_tab).astype(object)
+            shown.iloc[index] = '\033[41m' + str(shown.iloc[index])  + '\033[0m'
+            return("\n" + line + ("\nTable Titles:\n" if exception == "title" else "\nTable Tabular:\n") + str(shown))
         
         print("Table Options:")
         for key, v in self.table_options.items():
@@ -692,11 +1345,19 @@ r"""\begin¤[table¤][{position}]
  
         print("\n", line)
         print("Table Formatters:")
-        print(pd.DataFrame(self.formatters).apply(lambda x: x.apply(lambda y: format_brackets(y))))
+        print(pd.DataFrame(self.formatters.to_array()).map(lambda y: y.replace(CELL, "{}")))
 
         print("\n", line)
         print("Table Uncertanty:")
-        print(pd.DataFrame(self.uncertanty))
+        print(pd.DataFrame(self.uncertanty.to_array()))
+        relative = self.uncertanty_relative.to_array()
+        if relative.any():
+            print("Relative:")
+            print(pd.DataFrame(relative))
+        lower = self.uncertanty_lower.to_array()
+        if not np.isnan(lower).all():
+            print("Lower:")
+            print(pd.DataFrame(lower))
         
         print("\n", line)
         print("Title Linebreaks:")
@@ -707,25 +1368,48 @@ r"""\begin¤[table¤][{position}]
         for i, l in enumerate(self.linebreaks["tabular"]):
             print(i, ": ", *l)
 
-    def _check_lines(self):
-        def check_column(column):
-            idx_column = np.zeros(len(column)-1)
-            for i in range(len(column) - 1):
-                if isinstance(column[i], multirow) or isinstance(column[i], multirow_spacer):
-                    if isinstance(column[i+1], multirow_spacer):
-                        idx_column[i] = 1
-            return idx_column
-        
-        idx_array = np.array([np.array(check_column(col), dtype=bool) 
-                              for col in self.data.copy().to_numpy().T]).T
-        for i, bool_row in enumerate(idx_array):
-            idx_array = np.where(bool_row, None, (np.arange(len(bool_row))))
-            idx_array = np.array(idx_array, dtype=str)
-            idx_str_L = "".join(idx_array).split("None")
-            new_breakline = [r"\\"]
-            for j, line_string in enumerate(idx_str_L):
-                if len(line_string) == self.cols:
-                    new_breakline.append(cline_obj(string_val="hline"))
-                elif line_string:
-                    new_breakline.append(cline_obj(int(line_string[0]), len(line_string)))
-            self.linebreaks["tabular"][i] = new_breakline
\ No newline at end of file
+    def _grid_rules(self, rows):
+        """
+        Sets the rules of the grid style again after a change of the tabular, for the given rows
+        and the rows with multirows, which are the only ones that can have anything but a \\hline.
+        """
+        if self.format_options["style"] != "grid":
+            return
+        self._check_lines(np.concatenate([self._spans["tabular"].multirows.covered()[1], rows]).astype(int))
+        if self.rows and self.linebreaks["tabular"].get(-1) == [r"\\"]:
+            self.linebreaks["tabular"][-1].append(r" \hline") # A new last row
+
+    def _check_lines(self, rows = None):
+        """
+        Sets the rules of the grid style under the rows of the tabular, all rows but the last or the given rows.
+        The rule is a \\hline, or clines around the columns where a multirow continues into the next row.
+        """
+        rows = np.arange(self.rows - 1) if rows is None else np.unique(rows)
+        rows = rows[(rows >= 0) & (rows < self.rows - 1)]
+        spans = self._spans["tabular"]
+        # Columns and rows where a multirow continues into the row below
+        cont_cols, cont_rows = spans.multirows.covered()
+        inside = np.isin(cont_rows, rows)
+        cont_cols, cont_rows = cont_cols[inside], cont_rows[inside]
+        # The other rows get the default of the grid style, a \hline
+        linebreaks = self.linebreaks["tabular"]
+        kept = np.fromiter(linebreaks.rows, dtype=int, count=len(linebreaks.rows))
+        linebreaks.reset(kept[np.isin(kept, rows) & ~np.isin(kept, cont_rows)].tolist())
+
+        # Runs of columns with a rule in the rows with multirows continuing, one cline each
+        order = np.lexsort((cont_cols, cont_rows))
+        cont_cols, cont_rows = cont_cols[order], cont_rows[order]
+        split_rows, first = np.unique(cont_rows, return_index=True)
+        found = ([], [], [], [])
+        for i, blocked in zip(split_rows.tolist(), np.split(cont_cols, first[1:])):
+            ruled = np.ones(self.cols + 2, dtype=np.int8)
+            ruled[[0, -1]] = 0
+            ruled[blocked + 1] = 0
+            edges = np.flatnonzero(np.diff(ruled))
+            clines = [cline_obj(int(start), int(stop - start)) for start, stop in zip(edges[::2], edges[1::2])]
+            linebreaks[i] = [r"\\"] + clines
+            for cl in clines:
+                for L, v in zip(found, (i, cl.start - 1, cl.stop, cl)):
+                    L.append(v)
+        spans.clines = spans.clines.replace_lines(rows, *found)
+        self._linebreak_cache = None
\ No newline at end of file
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                          Parallel rendering of a table
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import mmap
+import numpy as np
+from .column_formatting import format_rows
+from .cell_store import sorted_cells
+
+_attached = {} # Columns attached in a worker process, {key: (array, handle keeping it alive)}
+
+
+def _memmap_root(column):
+    "The memory mapped array column is a view of, None if it is not one"
+    base = column
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap) and isinstance(base.base, mmap.mmap):
+            return base
+        base = base.base
+    return None
+
+def share_column(column, segments) -> tuple:
+    """
+    How a worker process finds a numeric column without it being pickled:
+    memory mapped columns are mapped again from their file, other columns are copied once into shared memory,
+    which is added to segments. Object columns are sent with each block instead, their spec is None.
+    """
+    if column.dtype.kind not in "biuf":
+        return None
+    root = _memmap_root(column)
+    if root is not None and root.filename:
+        delta = column.ctypes.data - root.ctypes.data
+        return ("memmap", root.filename, root.dtype.str, root.offset, root.shape,
+                "F" if root.flags.f_contiguous and not root.flags.c_contiguous else "C",
+                column.dtype.str, column.shape, column.strides, delta)
+    from multiprocessing import shared_memory
+    segment = shared_memory.SharedMemory(create = True, size = max(column.nbytes, 1))
+    np.ndarray(column.shape, column.dtype, buffer = segment.buf)[:] = column
+    segments.append(segment)
+    return ("shm", segment.name, column.dtype.str, column.shape)
+
+def _attach(spec) -> np.ndarray:
+    "The column described by spec, see share_column. Runs in the worker processes"
+    key = spec[:2] + spec[-4:] if spec[0] == "memmap" else spec
+    if key in _attached:
+        return _attached[key][0]
+    if spec[0] == "memmap":
+        _, filename, dtype, offset, shape, order, column_dtype, column_shape, strides, delta = spec
+        root = np.memmap(filename, dtype = dtype, mode = "r", offset = offset, shape = shape, order = order)
+        column = np.ndarray(column_shape, column_dtype, buffer = root, offset = delta, strides = strides)
+        handle = root
+    else:
+        from multiprocessing import shared_memory
+        _, name, dtype, shape = spec
+        try:
+            handle = shared_memory.SharedMemory(name = name, track = False)
+        except TypeError: # Before python 3.13, the registration is shared with the parent which removes it on unlink
+            handle = shared_memory.SharedMemory(name = name)
+        column = np.ndarray(shape, dtype, buffer = handle.buf)
+    _attached[key] = (column, handle)
+    return column
+
+def _render_block(task) -> np.ndarray:
+    "Formats the rows of one block. Runs in the worker processes"
+    specs, objects, start, stop, special, precision, uncertanty, formatters, lower, error_digits = task
+    columns = [objects[j] if spec is None else _attach(spec)[start:stop] for j, spec in enumerate(specs)]
+    return format_rows(columns, special, precision, uncertanty, formatters, 0, None, lower, error_digits)
+
+def render_blocks(columns, special, precision, uncertanty, formatters, lower, error_digits, block_rows, jobs):
+    """
+    Generator formatting the tabular in blocks of block_rows rows in jobs processes, yielding the rows
+    of each block, joined by '&', in order. See format_rows for the arguments.
+    The numeric columns are shared with the processes once, only the other columns and the settings
+    of the rows in each block are sent with the block.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    n_rows = len(columns[0])
+    special = sorted_cells(special)
+    segments = []
+    try:
+        specs = [share_column(np.asarray(column), segments) for column in columns]
+        def tasks():
+            for start in range(0, n_rows, block_rows):
+                stop = min(start + block_rows, n_rows)
+                rows, cols = slice(start, stop), slice(None)
+                yield (specs, {j: column[start:stop] for j, (spec, column) in enumerate(zip(specs, columns)) if spec is None},
+                       start, stop, special.block(start, stop),
+                       precision, uncertanty.take(rows, cols), formatters.take(rows, cols),
+                       lower.take(rows, cols), error_digits)
+        with ProcessPoolExecutor(max_workers = jobs) as executor:
+            yield from executor.map(_render_block, tasks())
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
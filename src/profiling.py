@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                   Profiling
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import time
+import functools
+import itertools
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_active = None # The profile_report being recorded into, if any
+_tokens = itertools.count() # Numbers the tables profiled, ids are reused once a table is garbage collected
+
+
+class profile_report:
+    """
+    Wall time, number of calls and tracemalloc peak of each phase of each table profiled.
+
+    Phases:
+        construct: The constructor or from_csv/from_iterable, including infer_precision.
+        infer_precision: Inferring the number of decimals of the columns.
+        titles: Rendering the titles.
+        body: Formatting the cells of the tabular.
+        write: Writing the document to a file.
+
+    Peaks are in bytes above the memory traced when the phase started, 0 if memory was not traced.
+    Reports of several runs or processes are added up with merge().
+    """
+    def __init__(self, memory = True):
+        self.memory = memory
+        self.tables = {} # token of table -> {"label": str, "phases": {phase: {"time", "calls", "peak"}}}
+        self._stack = [] # Phases currently running, innermost last
+
+    def _phases(self, table) -> dict:
+        key = getattr(table, "_profile_token", None)
+        if key is None:
+            key = table._profile_token = next(_tokens)
+        if key not in self.tables:
+            label = getattr(table, "table_options", {}).get("label", "")
+            self.tables[key] = {"label": label, "phases": {}}
+        elif not self.tables[key]["label"] and hasattr(table, "table_options"):
+            # The label is not set yet when the constructor starts
+            self.tables[key]["label"] = table.table_options["label"]
+        return self.tables[key]["phases"]
+
+    def record(self, table, name, seconds, peak):
+        stats = self._phases(table).setdefault(name, {"time": 0.0, "calls": 0, "peak": 0})
+        stats["time"] += seconds
+        stats["calls"] += 1
+        stats["peak"] = max(stats["peak"], peak)
+
+    def total(self) -> dict:
+        "The phases added up over all tables, times and calls are summed and the largest peak kept"
+        total = {}
+        for entry in self.tables.values():
+            for name, stats in entry["phases"].items():
+                summed = total.setdefault(name, {"time": 0.0, "calls": 0, "peak": 0})
+                summed["time"] += stats["time"]
+                summed["calls"] += stats["calls"]
+                summed["peak"] = max(summed["peak"], stats["peak"])
+        return total
+
+    def merge(self, other) -> "profile_report":
+        "Adds the tables of another report, ex. from another process, to this one"
+        for key, entry in other.tables.items():
+            while key in self.tables:
+                key = (key, "merged")
+            self.tables[key] = {"label": entry["label"],
+                                "phases": {name: dict(stats) for name, stats in entry["phases"].items()}}
+        return self
+
+    def as_dict(self) -> dict:
+        "Plain lists and dicts, ex. to be dumped as json"
+        return {"tables": [{"label": entry["label"], "phases": entry["phases"]} for entry in self.tables.values()],
+                "total": self.total()}
+
+    def __str__(self):
+        lines = [f"{'phase':<18}{'time [ms]':>12}{'calls':>8}{'peak [KiB]':>12}"]
+        for name, stats in self.total().items():
+            lines.append(f"{name:<18}{stats['time'] * 1000:>12.2f}{stats['calls']:>8}{stats['peak'] / 1024:>12.1f}")
+        return f"{len(self.tables)} tables\n" + "\n".join(lines)
+
+
+@contextmanager
+def profile(memory = True):
+    """
+    Context manager recording the phases of every table built, rendered or saved inside it.
+    Yields the profile_report. With memory = True tracemalloc is started, which slows everything down.
+    Work done in other processes, like render_many with jobs > 1, is not recorded.
+
+    Ex:
+        with latex_table.profile() as report:
+            table = latex_table(...)
+            table.save("table")
+        print(report)
+    """
+    global _active
+    outer = _active
+    report = profile_report(memory)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _active = report
+    try:
+        yield report
+    finally:
+        _active = outer
+        if started:
+            tracemalloc.stop()
+        if outer is not None:
+            outer.merge(report)
+
+@contextmanager
+def _phase(report, table, name):
+    stack = report._stack
+    memory = report.memory and tracemalloc.is_tracing()
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        # The peak so far belongs to the phase around this one, tracing restarts from here
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+    entry = [current if memory else 0, 0]
+    stack.append(entry)
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - t
+        stack.pop()
+        peak = 0
+        if memory:
+            traced_peak = tracemalloc.get_traced_memory()[1]
+            peak = max(entry[1], traced_peak) - entry[0]
+            if stack:
+                stack[-1][1] = max(stack[-1][1], traced_peak)
+        report.record(table, name, seconds, peak)
+
+def phase(table, name):
+    "Context manager recording a phase of table, does nothing when no profile is running"
+    if _active is None:
+        return nullcontext()
+    return _phase(_active, table, name)
+
+def profiled(name):
+    "Decorator recording a method as a phase of the table it is called on"
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if _active is None:
+                return method(self, *args, **kwargs)
+            with _phase(_active, self, name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
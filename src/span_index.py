@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                       Index of multicolumns, multirows and clines
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import bisect
+
+import numpy as np
+from .helper_classes import cline_obj
+
+
+class span_index:
+    """
+    Intervals [start, stop) on numbered lines, ex. the columns a multicolumn covers in its row,
+    kept sorted by line and start in numpy arrays.
+
+    Looking up the interval overlapping a new one is a binary search, as the intervals on a line do not overlap.
+    Inserted lines and positions move every interval after them in one pass over the arrays.
+    Added intervals are kept in a sorted list per line and merged into the arrays in one pass
+    the next time the arrays are read, or once there are as many of them as in the arrays,
+    so adding n intervals does not copy the arrays n times.
+    items, if given, holds an object for each interval, ex. the cline_obj of a cline or the multirow of a multirow,
+    which is moved with the interval by its place(start, stop) method.
+    """
+    def __init__(self, lines = (), starts = (), stops = (), items = None):
+        lines = np.asarray(lines, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+        order = np.lexsort((starts, lines))
+        self._lines, self._starts, self._stops = lines[order], starts[order], stops[order]
+        self._items = None if items is None else [items[k] for k in order]
+        self._sort_keys()
+        self._pending = {} # line -> sorted list of (start, number added, stop, item) not merged yet
+        self._added = 0
+
+    def _merge(self):
+        "Merges the added intervals into the arrays, after the intervals with the same start already in them"
+        if not self._pending:
+            return
+        added = [(line, start, n, stop, item) for line, L in self._pending.items() for start, n, stop, item in L]
+        self._pending, self._added = {}, 0
+        added.sort(key = lambda e: e[:3])
+        lines, starts, _, stops, items = zip(*added)
+        lines, starts = np.array(lines, dtype=np.int64), np.array(starts, dtype=np.int64)
+        at = np.searchsorted(self._keys, self._key(lines, starts), side="right")
+        self._lines = np.insert(self._lines, at, lines)
+        self._starts = np.insert(self._starts, at, starts)
+        self._stops = np.insert(self._stops, at, np.array(stops, dtype=np.int64))
+        if self._items is not None:
+            merged, last = [], 0
+            for k, item in zip(at.tolist(), items):
+                merged += self._items[last:k]
+                merged.append(item)
+                last = k
+            self._items = merged + self._items[last:]
+        self._sort_keys()
+
+    @property
+    def lines(self) -> np.ndarray:
+        self._merge()
+        return self._lines
+
+    @property
+    def starts(self) -> np.ndarray:
+        self._merge()
+        return self._starts
+
+    @property
+    def stops(self) -> np.ndarray:
+        self._merge()
+        return self._stops
+
+    @property
+    def items(self) -> list:
+        self._merge()
+        return self._items
+
+    @classmethod
+    def of_clines(cls, linebreaks) -> "span_index":
+        "Index of the clines with columns in the row_linebreaks of the titles or the tabular"
+        found = [(i, e) for i, L in linebreaks.items() for e in L if isinstance(e, cline_obj) and not e.string_val]
+        return cls([i for i, e in found], [e.start - 1 for i, e in found], [e.stop for i, e in found],
+                   [e for i, e in found])
+
+    @staticmethod
+    def _key(lines, starts):
+        return (lines << 32) + starts
+
+    def _sort_keys(self):
+        self._keys = self._key(self._lines, self._starts)
+
+    def __len__(self):
+        return len(self._lines) + self._added
+
+    def add(self, line, start, stop, item = None):
+        "Adds the interval [start, stop) on line"
+        self._added += 1
+        bisect.insort(self._pending.setdefault(int(line), []), (int(start), self._added, int(stop), item))
+        if self._added > len(self._lines):
+            self._merge()
+
+    def find(self, line, start, stop) -> tuple:
+        "The interval (start, stop) on line overlapping [start, stop), None if there is none"
+        # The last interval starting before stop is the only one that can reach past start
+        k = int(np.searchsorted(self._keys, self._key(line, stop), side="left")) - 1
+        if k >= 0 and self._lines[k] == line and self._stops[k] > start:
+            return int(self._starts[k]), int(self._stops[k])
+        added = self._pending.get(line, [])
+        k = bisect.bisect_left(added, (stop,)) - 1
+        if k >= 0 and added[k][2] > start:
+            return added[k][0], added[k][2]
+        return None
+
+    def covered(self) -> tuple:
+        """
+        The lines and positions inside the intervals that are followed by another position of the same interval,
+        ex. the columns and rows of a multirow that continue into the row below, as two arrays.
+        """
+        lengths = np.maximum(self.stops - self.starts - 1, 0)
+        first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(self.lines, lengths), np.repeat(self.starts, lengths) + np.arange(lengths.sum()) - first
+
+    def replace_lines(self, lines, lines_new, starts_new, stops_new, items_new = None) -> "span_index":
+        "The index with the intervals on lines replaced by the new ones"
+        keep = ~np.isin(self.lines, lines)
+        items = None if self.items is None else [self.items[k] for k in np.flatnonzero(keep)] + list(items_new)
+        return span_index(np.concatenate([self.lines[keep], lines_new]), np.concatenate([self.starts[keep], starts_new]),
+                          np.concatenate([self.stops[keep], stops_new]), items)
+
+    def crossing(self, cuts) -> np.ndarray:
+        "Positions of the intervals with any of the cuts strictly inside them"
+        cuts = np.sort(np.asarray(cuts, dtype=np.int64))
+        return np.flatnonzero(np.searchsorted(cuts, self.starts, side="right") <
+                              np.searchsorted(cuts, self.stops, side="left"))
+
+    def insert_line(self, index):
+        "A line is inserted at index, the lines after it are moved down"
+        self.lines[self.lines >= index] += 1
+        self._sort_keys()
+
+    def insert_position(self, index):
+        """
+        A position is inserted at index on every line. Intervals after it are moved
+        and intervals it is inserted into are made one longer, the items of the changed intervals are placed again.
+        """
+        after = self.starts >= index
+        changed = after | (self.stops > index)
+        self.starts[after] += 1
+        self.stops[changed] += 1
+        self._sort_keys()
+        if self.items is not None:
+            for k in np.flatnonzero(changed):
+                self.items[k].place(int(self.starts[k]), int(self.stops[k]))
+
+    def _select(self, keep, lines, starts, stops) -> "span_index":
+        return span_index(lines[keep], starts[keep], stops[keep],
+                          None if self.items is None else [self.items[k] for k in np.flatnonzero(keep)])
+
+    def cut(self, lines, span) -> "span_index":
+        """
+        The intervals inside lines[0]:lines[1] and span[0]:span[1], as an index of the cut out part.
+        Intervals crossing the edges of span are dropped, see crossing.
+        """
+        keep = ((self.lines >= lines[0]) & (self.lines < lines[1]) &
+                (self.starts >= span[0]) & (self.stops <= span[1]))
+        return self._select(keep, self.lines - lines[0], self.starts - span[0], self.stops - span[0])
+
+    def remap_lines(self, moved) -> "span_index":
+        "The index with line i moved to moved[i], intervals on lines moved to -1 are dropped"
+        lines = np.asarray(moved)[self.lines] if len(self) else self.lines
+        return self._select(lines >= 0, lines, self.starts, self.stops)
+
+    def remap_spans(self, moved) -> "span_index":
+        "The index with position i moved to moved[i], intervals with an end moved to -1 are dropped"
+        moved = np.asarray(moved)
+        starts = moved[self.starts] if len(self) else self.starts
+        stops = moved[self.stops - 1] + 1 if len(self) else self.stops
+        return self._select((starts >= 0) & (stops > 0), self.lines, starts, stops)
+
+    def __repr__(self):
+        return f"span_index({[(int(l), int(a), int(b)) for l, a, b in zip(self.lines, self.starts, self.stops)]})"
+
+
+class table_spans:
+    """
+    The multicolumns, multirows and clines of the titles or of the tabular.
+    Multicolumns and clines are intervals of columns on their row, multirows intervals of rows on their column.
+    The items are the multicolumn, multirow and cline_obj objects, so a row or column inserted inside a span
+    also makes the cell rendering it one longer.
+    """
+    def __init__(self, multicolumns = None, multirows = None, clines = None):
+        self.multicolumns = span_index(items = []) if multicolumns is None else multicolumns
+        self.multirows = span_index(items = []) if multirows is None else multirows
+        self.clines = span_index(items = []) if clines is None else clines
+
+    def insert(self, axis, index):
+        "Moves the spans after a row (axis = 0) or column (axis = 1) inserted at index"
+        if axis == 0:
+            self.multicolumns.insert_line(index)
+            self.multirows.insert_position(index)
+            self.clines.insert_line(index)
+        else:
+            self.multicolumns.insert_position(index)
+            self.multirows.insert_line(index)
+            self.clines.insert_position(index)
+
+    def cut(self, rows, cols, linebreaks) -> "table_spans":
+        "The spans of the part rows[0]:rows[1], cols[0]:cols[1], with the clines of its linebreak lists"
+        return table_spans(self.multicolumns.cut(rows, cols), self.multirows.cut(cols, rows),
+                           span_index.of_clines(linebreaks))
+
+    def remap(self, moved, linebreaks) -> "table_spans":
+        "The spans with row i moved to moved[i], -1 for rows that are dropped, see cell_rules.remap"
+        return table_spans(self.multicolumns.remap_lines(moved), self.multirows.remap_spans(moved),
+                           span_index.of_clines(linebreaks))
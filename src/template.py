@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+-------------------------------------------------------------------------------
+===============================================================================
+
+                                 Table templates
+
+===============================================================================
+-------------------------------------------------------------------------------
+"""
+
+import numpy as np
+from .helper_classes import is_multi
+from .cell_store import cell_store, table_columns
+from .column_formatting import infer_precision
+
+
+class table_template:
+    """
+    The layout of a finished latex_table, made with latex_table.template(), reused for new data.
+
+    The titles, units, multicolumns and multirows, formatters, uncertanties, conditional formats and options
+    are kept as they are when the template is made. bind() puts new columns in place of the columns the table
+    was made from, the rows and columns added by make_multicolumn and make_multirow stay where they were.
+    Nothing is replayed, the titles are rendered once and only the tabular is formatted for the new data.
+
+    The new columns can have another number of rows than the table. Settings of single rows, like uncertanties
+    given row by row, follow the rows that exist in both, settings of whole columns cover all the rows.
+    Rows added to the tabular must come before the last row of the new data or after all the data rows.
+
+    Ex:
+        template = table.template()
+        for run in runs:
+            template.bind(run.energy, run.counts).save(run.name)
+    """
+    def __init__(self, table):
+        self.table = table._copy()
+        self.titles = table._make_titles() # Rendered once
+        self.layout_rows, self.layout_cols = self.table._added["rows"], self.table._added["cols"]
+        # Added rows are kept before the data row they were added before, or last
+        self.anchors = self.layout_rows - np.arange(len(self.layout_rows))
+        self.data_cols = np.setdiff1d(np.arange(self.table.cols), self.layout_cols)
+        # Multicolumns and multirows written over cells of the data
+        data = self.table.data
+        self.overlays = [(i, j, data[i, j]) for j in self.data_cols for i in data.special[j]
+                         if is_multi(data.special[j][i])]
+
+    @property
+    def shape(self) -> tuple:
+        "Number of rows and columns of the data the template takes"
+        return self.table.rows - len(self.layout_rows), len(self.data_cols)
+
+    def bind(self, *columns, infer: bool = False):
+        """
+        A new latex_table with the layout of the template and columns as its data.
+
+        Args:
+            *columns: The columns of the data, as many as the table was made with. A single 2D-array,
+            structured array, DataFrame or pyarrow table is split into its columns.
+            infer (bool, optional): Infer the precision of the new columns instead of using the precision
+            of the template. Defaults to False.
+
+        Returns:
+            latex_table: The table, which can be changed further without changing the template.
+        """
+        if len(columns) == 1 and (np.ndim(columns[0]) == 2 or hasattr(columns[0], "column_names") or
+                                  getattr(getattr(columns[0], "dtype", None), "names", None)):
+            columns = table_columns(columns[0])[1]
+        n_rows, n_cols = self.shape
+        if len(columns) != n_cols:
+            raise ValueError(f"The template takes {n_cols} columns, {len(columns)} were given")
+        template = self.table
+        store = cell_store.from_lists(columns, fill = template.format_options["nan_char"])
+        rows = len(store)
+        anchors = np.where(self.anchors == n_rows, rows, self.anchors)
+        if (anchors > rows).any():
+            raise ValueError(f"The template has rows added before data row {anchors.max()}, "
+                             f"only {rows} rows were given")
+
+        # Where the rows of the template go in the new table, -1 for data rows that are not there
+        total = rows + len(anchors)
+        new_layout_rows = anchors + np.arange(len(anchors))
+        is_data = np.ones(total, dtype = bool)
+        is_data[new_layout_rows] = False
+        new_data_rows = np.flatnonzero(is_data)
+        moved = np.full(template.rows, -1)
+        moved[self.layout_rows] = new_layout_rows
+        source = np.setdiff1d(np.arange(template.rows), self.layout_rows)
+        moved[source[:min(rows, n_rows)]] = new_data_rows[:min(rows, n_rows)]
+
+        # The data is spread out over the columns and rows of the template
+        old_data = template.data
+        if len(self.layout_cols):
+            source_rows = source[:min(rows, n_rows)]
+            store.expand(1, self.data_cols, self.layout_cols,
+                         [[old_data[i, j] for i in source_rows] + [""] * (rows - len(source_rows))
+                          for j in self.layout_cols], template.cols)
+        if len(anchors):
+            store.expand(0, new_data_rows, new_layout_rows,
+                         [old_data.row(i) for i in self.layout_rows], total)
+        for i, j, value in self.overlays:
+            if moved[i] >= 0:
+                store[moved[i], j] = value
+
+        table = template._copy(data = store, moved = moved)
+        table._added = {"rows": new_layout_rows, "cols": self.layout_cols.copy()}
+        table._title_cache = self.titles
+        # The rows that were not in the template get the rules of the grid style, the rows of the template keep theirs
+        new_rows = np.setdiff1d(np.arange(total), moved)
+        if table.format_options["style"] == "grid" and len(new_rows):
+            table._check_lines(new_rows)
+        if infer:
+            for k, j in enumerate(self.data_cols):
+                decimals = infer_precision(np.asarray(columns[k]))
+                if decimals is not None:
+                    table.format_options["precision"][j] = decimals
+        return table
+
+    def render(self, *columns, jobs: int = 1) -> str:
+        "The template rendered with columns as its data, see bind"
+        return self.bind(*columns).render(jobs)
+
+    def save(self, buf, *columns, **kwargs) -> bool:
+        "Saves the template with columns as its data, see bind and latex_table.save"
+        return self.bind(*columns).save(buf, **kwargs)
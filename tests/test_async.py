@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Saving and iterating tables from asyncio code
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def make_table(rows = 25):
+    table = latex_table(["a", "b", "c"], np.linspace(0, 1, rows), np.arange(rows), [f"r{i}" for i in range(rows)])
+    table.make_multicolumn("title", 0, 0, 2, "ab")
+    table.set_uncertanty(0.05, 0)
+    return table
+
+async def collect(fragments) -> str:
+    return "".join([fragment async for fragment in fragments])
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 1000])
+def test_iter_document_async_matches_str(chunk_rows):
+    table = make_table()
+    assert asyncio.run(collect(table.iter_document_async(chunk_rows))) == str(table)
+
+def test_save_async_matches_str(tmp_path):
+    table = make_table()
+    path = tmp_path / "table.tex"
+    assert asyncio.run(table.save_async(path, abspath = True, chunk_rows = 4))
+    assert path.read_text(encoding = "utf-8") == str(table)
+    assert not asyncio.run(table.save_async(path, abspath = True)) # Same content
+
+def test_tables_saved_at_the_same_time(tmp_path):
+    tables = [make_table(rows) for rows in (3, 30, 300)]
+    async def save_all():
+        return await asyncio.gather(*[table.save_async(tmp_path / f"{k}.tex", abspath = True, chunk_rows = 5)
+                                      for k, table in enumerate(tables)])
+    assert asyncio.run(save_all()) == [True] * 3
+    assert [(tmp_path / f"{k}.tex").read_text(encoding = "utf-8") for k in range(3)] == [str(t) for t in tables]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Rendering and saving many tables
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+from src.batch import render_many
+
+
+def items():
+    return [("first", {"data": (["a"], [1, 2]), "caption": "first"}),
+            ("lambda", lambda: latex_table(["a"], [3, 4])),
+            ("broken", {"data": ()}),
+            ("last", {"data": (["b"], [5.5])})]
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_failing_table_does_not_stop_the_others(jobs):
+    results = render_many(items(), jobs = jobs)
+    assert [result["name"] for result in results] == ["first", "lambda", "broken", "last"]
+    assert results[0]["error"] is None and "first" in results[0]["output"]
+    assert results[2]["error"] and results[2]["output"] is None
+    assert results[3]["error"] is None and "5.5" in results[3]["output"]
+    if jobs == 1:
+        assert results[1]["error"] is None
+    else: # A lambda can not be sent to another process
+        assert "pickle" in results[1]["error"]
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""
+Classifying and formatting the cells of a column
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.column_formatting import classify_column, infer_precision, NUMERIC, STRING, OTHER
+
+
+def test_classify_object_column():
+    column = np.array([1.5, "a", pd.NA, None, 2, "b"], dtype=object)
+    assert classify_column(column).tolist() == [NUMERIC, STRING, OTHER, OTHER, NUMERIC, STRING]
+
+def test_precision_of_float32():
+    assert infer_precision(np.array([0.1, 0.25], dtype=np.float32)) == 2
+    assert infer_precision(np.array([1.23456, 2.5], dtype=np.float32)) == 5
+    assert infer_precision(np.array([0.1, 0.25])) == 2
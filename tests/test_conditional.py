@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Conditional formats of highlight() and where()
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+from src.conditional import highlight, where
+
+
+def body_rows(table) -> list:
+    return table._make_table_body().split(" \\\\\n\t\t")[:-1]
+
+def test_masks_leave_out_nan():
+    numbers = np.array([[1.0, np.nan], [np.nan, 2.0], [3.0, 2.0]])
+    assert highlight("max", 0, "").mask(numbers).tolist() == [[False, False], [False, True], [True, True]]
+    assert highlight("min", 1, "").mask(numbers).tolist() == [[True, False], [False, True], [False, True]]
+    assert highlight("max", None, "").mask(numbers).tolist() == [[False, False], [False, False], [True, False]]
+    assert where(lambda col: ~(col > 1.5), "").mask(numbers).tolist() == [[True, False], [False, False], [False, False]]
+
+def test_conditions_around_column_formatter():
+    table = latex_table(["a", "b"], [1.5, np.nan, 3.5], [4, 1, 2])
+    table.set_formatters("it", col = 1)
+    table.highlight("max")
+    table.where(lambda col: col < 2, fmt = "ul")
+    assert body_rows(table) == [r"\ul{1.5} & \textbf{\textit{4}}",
+                                r"nan & \ul{\textit{1}}",
+                                r"\textbf{3.5} & \textit{2}"]
+
+def test_conditions_are_evaluated_when_the_data_changes():
+    calls = []
+    def condition(col):
+        calls.append(len(col))
+        return col > 3
+    table = latex_table(["a", "b"], [1.5, 2.5, 3.5], [4, 1, 2])
+    table.where(condition, cols = 0)
+    str(table)
+    str(table)
+    table.set_formatters("it", col = 1) # Composed again, not evaluated again
+    assert len(calls) == 1 and body_rows(table)[0] == r"1.5 & \textit{4}"
+    table.make_multicolumn("tabular", 2, 0, 2, "x", insert = True)
+    table.highlight("max", cols = 1)
+    assert body_rows(table) == [r"1.5 & \textbf{\textit{4}}", r"2.5 & \textit{1}", r"\multicolumn{2}{c}{x}"]
+    assert len(calls) == 2
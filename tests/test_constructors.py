@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tables made from files and iterables
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+from src.cell_store import column_buffer
+
+
+def test_from_iterable_without_rows():
+    with pytest.raises(ValueError, match = "No data given"):
+        latex_table.from_iterable([])
+    with pytest.raises(ValueError, match = "No data given"):
+        latex_table.from_iterable([], titles = ["a"])
+
+def test_from_iterable_in_chunks():
+    rows = [(f"r{i}", i, i / 4) for i in range(25)]
+    chunked = latex_table.from_iterable(iter(rows), titles = ["name", "n", "x"], chunk_rows = 4)
+    whole = latex_table(["name", "n", "x"], *map(list, zip(*rows)))
+    assert str(chunked) == str(whole)
+
+def test_from_csv_in_chunks(tmp_path):
+    path = tmp_path / "table.csv"
+    path.write_text("a,b\n" + "".join(f"{i},{i / 8 if i % 5 else ''}\n" for i in range(50)))
+    chunked = latex_table.from_csv(path, chunk_rows = 7)
+    assert chunked.data.shape == (50, 2)
+    assert str(chunked) == str(latex_table.from_csv(path))
+
+def test_column_buffer_changes_type():
+    buffer = column_buffer()
+    for chunk in ([1, 2], [2.5], ["x", 3]):
+        buffer.append(chunk)
+    column = buffer.finish()
+    assert column.dtype == object and column.tolist() == [1, 2, 2.5, "x", 3]
+
+def test_data_frame_with_missing_values():
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"n": pd.array([1, None, 3], dtype = "Int64"),
+                          "x": pd.array([0.5, pd.NA, 1.5], dtype = "Float64"),
+                          "s": np.array(["a", pd.NA, "c"], dtype = object)})
+    table = latex_table(frame, nan_char = "--")
+    assert table._make_table_body().split(r"\\")[1].strip() == "-- & -- & --"
+
+def test_data_frame_with_numbered_columns():
+    pd = pytest.importorskip("pandas")
+    table = latex_table(pd.DataFrame(np.arange(6).reshape(3, 2)))
+    assert table.titles.column(0).tolist() == ["0"]
+    assert r"0 & 1 \\" in str(table)
+
+def test_from_npy_memory_does_not_grow_with_rows(tmp_path):
+    # The columns stay memory mapped, only a block of rows is read at the time to infer the precision
+    peaks = []
+    for n_rows in (1 << 20, 1 << 22):
+        path = tmp_path / f"{n_rows}.npy"
+        np.save(path, np.arange(n_rows) / 8)
+        tracemalloc.start()
+        table = latex_table.from_npy(path, titles = ["x"])
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert table.rows == n_rows
+        del table
+    assert peaks[1] < 1.25 * peaks[0]
+
+def test_rows_of_strings_and_numbers():
+    # Rendered by the table before the columns were typed, the numbers keep their precision
+    table = latex_table([["a", 1.23456, 3], ["b", 2.5, 4]], titles = ["x", "y", "z"])
+    assert table._make_table_body() == "a & 1.23456 & 3 \\\\\n\t\tb & 2.50000 & 4 \\\\\n\t\t\\bottomrule"
+
+def test_ragged_rows_are_padded():
+    table = latex_table([["a", 1.23456, 3], ["b", 2.5]], titles = ["x", "y", "z"])
+    assert table._make_table_body() == "a & 1.23456 & 3 \\\\\n\t\tb & 2.50000 & nan \\\\\n\t\t\\bottomrule"
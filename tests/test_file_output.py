@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Atomic saving of tables and the index of their digests
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.file_output import atomic_writer, digest_index, file_digest
+
+
+def save(path, content, index = None) -> bool:
+    with atomic_writer(path, index) as file:
+        file.write(content)
+        return file.commit()
+
+def test_unchanged_content_is_not_written(tmp_path):
+    path = tmp_path / "table.tex"
+    index = digest_index(tmp_path / ".digests")
+    assert save(path, "a & b", index)
+    os.utime(path, ns = (1, 1))
+    assert not save(path, "a & b", index)
+    assert os.stat(path).st_mtime_ns == 1
+    assert save(path, "a & c", index) and path.read_text() == "a & c"
+    assert list(tmp_path.glob("*.tmp")) == []
+
+def test_failed_write_leaves_the_old_file(tmp_path):
+    path = tmp_path / "table.tex"
+    save(path, "old")
+    with pytest.raises(RuntimeError):
+        with atomic_writer(path) as file:
+            file.write("half a ta")
+            raise RuntimeError("render failed")
+    assert path.read_text() == "old"
+    assert list(tmp_path.glob("*.tmp")) == []
+
+def test_index_is_stale_after_the_file_changes(tmp_path):
+    path = tmp_path / "table.tex"
+    index = digest_index(tmp_path / ".digests")
+    save(path, "a & b", index)
+    assert index.lookup(path, os.stat(path)) == file_digest(path)
+    os.utime(path, ns = (5, 5))
+    assert index.lookup(path, os.stat(path)) is None
+    save(path, "a & b", index) # Same content, only the index entry is renewed
+    assert index.lookup(path, os.stat(path)) == file_digest(path)
+    path.write_text("a & bc")
+    os.utime(path, ns = (5, 5))
+    assert index.lookup(path, os.stat(path)) is None
+    assert save(path, "a & b", index) and path.read_text() == "a & b"
+
+def test_mode_is_kept(tmp_path):
+    path = tmp_path / "table.tex"
+    save(path, "old")
+    os.chmod(path, 0o640)
+    save(path, "new")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason = "no symlinks")
+def test_symlink_is_followed(tmp_path):
+    (tmp_path / "tables").mkdir()
+    target = tmp_path / "tables" / "table.tex"
+    save(target, "old")
+    link = tmp_path / "table.tex"
+    link.symlink_to(target)
+    save(link, "new")
+    assert link.is_symlink() and target.read_text() == "new"
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Golden renders
+
+Tables rendered by the column formatting path compared byte for byte with the renders of the
+original cell by cell implementation, stored in golden_renders.json.
+
+The renders are made again from a checkout of the baseline commit, which needs pandas < 3, with
+
+    python tests/test_golden_renders.py <path to the baseline checkout>
+"""
+
+import sys
+import json
+import importlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+GOLDEN = Path(__file__).with_name("golden_renders.json")
+
+
+def columns(seed, n_rows):
+    "Label, float, int and mixed columns"
+    rng = np.random.default_rng(seed)
+    labels = [f"r{i}" for i in range(n_rows)]
+    floats = rng.normal(size = n_rows) * 10.0**rng.integers(-3, 4)
+    ints = list(rng.integers(0, 1000, n_rows))
+    mixed = [float(x) if i % 3 else f"s{i}" for i, x in enumerate(rng.normal(size = n_rows))]
+    return labels, floats, ints, mixed
+
+def build(latex_table, case):
+    "Builds one of the CASES with the latex_table class of the tree that is tested"
+    seed, style, units, uncertain, spans, formatted = case
+    labels, floats, ints, mixed = columns(seed, 8)
+    table = latex_table(["name", "x", "n", ("mixed", "col")], labels, floats, ints, mixed,
+                        caption = f"case {seed}", label = f"case-{seed}")
+    if units:
+        table.set_units(["", "m", "", "s"])
+    if uncertain:
+        table.set_uncertanty(np.abs(np.random.default_rng(seed).normal(size = 8)), 1)
+    if formatted:
+        table.set_formatters("textbf", col = 2)
+        table.set_formatters(r"\textit{}", row = 3)
+    if spans:
+        table.make_multirow("tabular", 0, 4, 3, "block")
+        table.make_multicolumn("tabular", 2, 2, 2, "group", cline = True)
+        table.make_multicolumn("title", 0, 2, 3, "values", cline = True)
+    if style == "grid":
+        table.set_style("grid")
+    table.set_options(precision = [0, 0, 3, 0, 2][-table.cols:])
+    return table
+
+CASES = [(seed, style, units, uncertain, spans, formatted)
+         for seed, style in enumerate(["booktabs", "grid"] * 4)
+         for units, uncertain, spans, formatted in [(False, False, False, False), (True, True, False, True),
+                                                    (False, True, True, False), (True, True, True, True)]]
+
+def case_id(case):
+    return "-".join(str(v) for v in case)
+
+
+def load(path):
+    "The latex_table class of the tree at path"
+    for name in [name for name in sys.modules if name == "src" or name.startswith("src.")]:
+        del sys.modules[name]
+    sys.path.insert(0, str(path))
+    try:
+        return importlib.import_module("src.latex_table").latex_table
+    finally:
+        sys.path.pop(0)
+
+@pytest.fixture(scope = "module")
+def latex_table():
+    # The modules imported by the other test files are put back, so their classes can still be pickled
+    modules = {name: module for name, module in sys.modules.items() if name == "src" or name.startswith("src.")}
+    yield load(ROOT)
+    for name in [name for name in sys.modules if name == "src" or name.startswith("src.")]:
+        del sys.modules[name]
+    sys.modules.update(modules)
+
+@pytest.fixture(scope = "module")
+def golden():
+    return json.loads(GOLDEN.read_text(encoding = "utf-8"))
+
+@pytest.mark.parametrize("case", CASES, ids = case_id)
+def test_render_matches_baseline(latex_table, golden, case):
+    assert str(build(latex_table, case)) == golden[case_id(case)]
+
+@pytest.mark.parametrize("case", CASES[:4], ids = case_id)
+def test_stream_matches_baseline(latex_table, golden, case, tmp_path):
+    table = build(latex_table, case)
+    table.set_options(chunk_rows = 3)
+    table.save(str(tmp_path / "table.tex"), abspath = True)
+    assert (tmp_path / "table.tex").read_text(encoding = "utf-8") == golden[case_id(case)]
+
+
+if __name__ == "__main__":
+    latex_table = load(Path(sys.argv[1]).resolve())
+    GOLDEN.write_text(json.dumps({case_id(case): str(build(latex_table, case)) for case in CASES}, indent = 1),
+                      encoding = "utf-8")
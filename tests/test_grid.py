@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Rules of the grid style around multicolumns and multirows
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def body_rows(table) -> list:
+    return table._make_table_body().split("\n\t\t")[:-1]
+
+def test_row_inserted_inside_multirow():
+    table = latex_table(["a", "b", "c"], [1, 2, 3, 4], [5, 6, 7, 8], [1, 1, 1, 1])
+    table.make_multirow("tabular", 0, 0, 3, "m")
+    table.set_style("grid")
+    table.make_multicolumn("tabular", 1, 1, 2, "x")
+    assert body_rows(table) == [r"\multirow{4}{*}{m} & 1 & 5 & 1 \\ \cline{2-4} ",
+                                r" & \multicolumn{2}{c|}{x} &  \\ \cline{2-4} ",
+                                r" & 2 & 6 & 1 \\ \cline{2-4} ",
+                                r" & 3 & 7 & 1 \\ \hline",
+                                r" & 4 & 8 & 1 \\ \hline"]
+
+def test_wide_grid_with_multicolumns_and_multirows():
+    table = latex_table([f"c{j}" for j in range(11)], *[[i + j for i in range(5)] for j in range(11)])
+    table.set_style("grid")
+    table.make_multirow("tabular", 0, 1, 3, "A")
+    # Inserted multirows sit in their last row and are drawn upwards over the spacers
+    table.make_multirow("tabular", 5, 4, 2, "B", insert=True)
+    table.make_multicolumn("tabular", 2, 2, 4, "G", cline=True)
+    table.make_multicolumn("title", 0, 1, 3, "T", cline=True)
+    assert str(table) == "\n".join([
+        r"\begin{table}[H]",
+        r"    \centering",
+        r"    \caption{}",
+        r"    \label{tab:}",
+        r"    \begin{tabular}{|c|c|c|c|c|c|c|c|c|c|c|c|}",
+        r"        \hline",
+        r"		 & c0 & c1 & c2 & c3 & c4 & c5 & c6 & c7 & c8 & c9 & c10 \\",
+        r"		 & \multicolumn{3}{c|}{T} &  &  &  &  &  &  &  &  \\ \cline{2-4} ",
+        r"		\hline",
+        r"         & 0 & 1 & 2 & 3 & 4 & 5 & 6 & 7 & 8 & 9 & 10 \\ \hline",
+        r"		\multirow{4}{*}{A} & 1 & 2 & 3 & 4 & 5 & 6 & 7 & 8 & 9 & 10 & 11 \\ \cline{2-12} ",
+        r"		 &  & \multicolumn{4}{c|}{G} &  &  &  &  &  &  \\ \cline{3-6} ",
+        r"		 & 2 & 3 & 4 & 5 & 6 & 7 & 8 & 9 & 10 & 11 & 12 \\ \cline{2-12} ",
+        r"		 & 3 & 4 & 5 & 6 &  & 8 & 9 & 10 & 11 & 12 & 13 \\ \cline{1-5}  \cline{7-12} ",
+        r"		 & 4 & 5 & 6 & 7 & \multirow{-2}{*}{B} & 9 & 10 & 11 & 12 & 13 & 14 \\ \hline",
+        r"		",
+        r"    \end{tabular}",
+        r"\end{table}"])
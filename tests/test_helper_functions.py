@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Latex macros applied to arrays of text by latex_formatter
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.helper_functions import latex_formatter
+
+
+def test_first_macro_innermost():
+    formatted = latex_formatter(["textbf", r"\ul"], ["a", "b"])
+    assert formatted.tolist() == [r"\ul{\textbf{a}}", r"\ul{\textbf{b}}"]
+
+def test_falsy_targets_are_empty():
+    assert latex_formatter("it", [0, "a", 1.5, None, ""]).tolist() == ["", r"\it{a}", r"\it{1.5}", "", ""]
+    assert latex_formatter("bf", np.array([0, 2, 3])).tolist() == ["", r"\bf{2}", r"\bf{3}"]
+
+def test_shape_is_kept():
+    formatted = latex_formatter("bf", np.array([["a", "b"], ["", "d"]]))
+    assert formatted.shape == (2, 2) and formatted.tolist() == [[r"\bf{a}", r"\bf{b}"], ["", r"\bf{d}"]]
+    assert latex_formatter("it", pd.Series(["x", "", "z"])).tolist() == [r"\it{x}", "", r"\it{z}"]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+Rendering the rows of one table in parallel processes
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def make_table(rows = 50):
+    table = latex_table(["a", "b", "c", "d"], np.linspace(0, 2, rows), np.arange(rows),
+                        [f"r{i}" for i in range(rows)], np.arange(rows, dtype = np.float32) / 8)
+    table.make_multicolumn("tabular", 10, 0, 2, "x", insert = True)
+    table.make_multirow("tabular", 2, 20, 3, "m", insert = True)
+    table.set_formatters("bf", col = 1)
+    table.set_uncertanty(0.25, 3)
+    table.highlight("max", cols = 0)
+    table.set_style("grid")
+    return table
+
+@pytest.mark.parametrize("chunk_rows", [None, 7])
+def test_parallel_matches_serial(chunk_rows):
+    table = make_table()
+    table.set_options(chunk_rows = chunk_rows)
+    serial = table.render()
+    assert table.render(jobs = 2) == serial
+    assert table.render() == serial # The cached cells are not changed by the parallel render
+
+def test_parallel_memory_mapped(tmp_path):
+    path = tmp_path / "data.npy"
+    np.save(path, np.arange(120, dtype = float).reshape(40, 3) / 3)
+    table = latex_table.from_npy(path, titles = ["a", "b", "c"], chunk_rows = 9)
+    assert table.render(jobs = 2) == table.render()
+
+def test_render_split_in_parallel():
+    table = make_table(24)
+    assert table.render_split(rows = 12, jobs = 2) == table.render_split(rows = 12)
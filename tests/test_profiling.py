@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Profiling the phases of tables
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+from src.profiling import profile_report
+
+
+class labelled:
+    def __init__(self, label):
+        self.table_options = {"label": label}
+
+def test_collected_tables_are_reported_apart():
+    report = profile_report(memory = False)
+    for i in range(3):
+        # Each object is freed before the next one is made, which then usually gets the same id
+        report.record(labelled(f"tab:t{i}"), "body", 0.1, 0)
+    assert [entry["label"] for entry in report.as_dict()["tables"]] == ["tab:t0", "tab:t1", "tab:t2"]
+    assert report.total()["body"]["calls"] == 3
+
+def test_phases_of_tables():
+    with latex_table.profile(memory = False) as report:
+        for i in range(2):
+            str(latex_table(["a"], [1, 2], label = f"t{i}"))
+    tables = report.as_dict()["tables"]
+    assert [table["label"] for table in tables] == ["tab:t0", "tab:t1"]
+    assert all(table["phases"]["construct"]["calls"] == 1 for table in tables)
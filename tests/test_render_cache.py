@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Renders from the cache after a change match the render of a table that was never rendered
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def make_table():
+    return latex_table(["a", "b", "c"], [1.25, 2.5, 3.75, 5.0], [1, 2, 3, 4], ["p", "q", "r", "s"])
+
+changes = {
+    "precision": lambda table: table.set_precision(1),
+    "precision column": lambda table: table.set_precision([3] + [0] * (table.cols - 1)),
+    "formatters column": lambda table: table.set_formatters("bf", col = 1),
+    "formatters cell": lambda table: table.set_formatters("it", row = 2, col = 0),
+    "units": lambda table: table.set_units(["m", "", "s"]),
+    "uncertanty": lambda table: table.set_uncertanty([0.1, 0.2, 0.3, 0.4], 0),
+    "column": lambda table: table.make_multirow("tabular", 1, 1, 2, "m"),
+    "row": lambda table: table.make_multicolumn("tabular", 2, 0, 3, "x"),
+    "multicolumn": lambda table: table.make_multicolumn("tabular", 1, 1, 2, "x", insert = True),
+    "multirow": lambda table: table.make_multirow("tabular", 0, 2, 2, "m", insert = True),
+    "grid": lambda table: table.set_style("grid"),
+}
+
+@pytest.mark.parametrize("name", changes)
+def test_change_after_render(name):
+    cached = make_table()
+    str(cached)
+    changes[name](cached)
+    fresh = make_table()
+    changes[name](fresh)
+    assert str(cached) == str(fresh)
+
+@pytest.mark.parametrize("first, second", [("row", "formatters cell"), ("column", "precision column"),
+                                           ("multicolumn", "uncertanty"), ("grid", "multirow"),
+                                           ("formatters column", "row")])
+def test_changes_between_renders(first, second):
+    cached = make_table()
+    str(cached)
+    changes[first](cached)
+    str(cached)
+    changes[second](cached)
+    fresh = make_table()
+    changes[first](fresh)
+    changes[second](fresh)
+    assert str(cached) == str(fresh)
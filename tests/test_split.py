@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Longtables and tables cut into pieces
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def numbered_table(rows: int, cols: int = 2):
+    return latex_table([f"c{j}" for j in range(cols)], *[np.arange(rows) + 10 * j for j in range(cols)])
+
+def body_rows(table) -> list:
+    return table._make_table_body().split("\n\t\t")
+
+def test_longtable_repeats_the_titles():
+    table = numbered_table(3)
+    table.set_environment("longtable")
+    titles = table._make_titles()
+    head, body = str(table).split(r"\endlastfoot")
+    first, rest = head.split(r"\endfirsthead")
+    assert first.count(titles) == 1 and rest.split(r"\endhead")[0].count(titles) == 1
+    assert r"\caption[]{ (continued)}" in rest
+    assert body.strip().startswith("0 & 10")
+
+@pytest.mark.parametrize("style, foot", [("booktabs", "\\bottomrule\n        \\endfoot"), 
+                                         ("grid", "\\endhead\n        \\endfoot")])
+def test_longtable_foot_follows_the_head(style, foot):
+    table = numbered_table(3)
+    table.set_style(style)
+    table.set_environment("longtable")
+    rendered = str(table)
+    assert foot in rendered
+    assert rendered.index(r"\endhead") < rendered.index(r"\endfoot") < rendered.index(r"\endlastfoot") < rendered.index("0 & 10")
+    # The last page is closed by the tabular
+    assert rendered.endswith(table._make_table_body() + "\n\\end{longtable}")
+
+def test_split_even():
+    table = numbered_table(4)
+    pieces = table.split(rows = 2)
+    assert [piece.rows for piece in pieces] == [2, 2]
+    assert [body_rows(piece)[0] for piece in pieces] == [r"0 & 10 \\", r"2 & 12 \\"]
+    assert [piece.table_options["label"] for piece in pieces] == ["tab:-1", "tab:-2"]
+    assert pieces[1].table_options["caption"] == " (2/2)"
+
+def test_split_remainder():
+    pieces = numbered_table(5, 3).split(rows = 2, cols = 2)
+    assert [(piece.rows, piece.cols) for piece in pieces] == [(2, 2), (2, 1), (2, 2), (2, 1), (1, 2), (1, 1)]
+    assert body_rows(pieces[-1])[0] == r"24 \\"
+    assert pieces[-1].table_options["caption"] == " (6/6)"
+
+def test_split_multirow_across_a_cut():
+    table = numbered_table(4)
+    table.make_multirow("tabular", 0, 1, 2, "m")
+    with pytest.raises(ValueError, match = "crosses a row cut"):
+        table.split(rows = 2)
+    assert len(table.split(rows = 3)) == 2
+
+def test_inserted_multicolumn_past_the_last_column():
+    table = numbered_table(2, 3)
+    before = str(table)
+    with pytest.raises(ValueError, match = "does not fit"):
+        table.make_multicolumn("tabular", 0, 1, 3, "x", insert = True)
+    assert str(table) == before
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Writing tables a block of rows at the time
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def make_table(rows = 23):
+    table = latex_table(["α", "b", "c"], np.linspace(0, 1, rows), np.arange(rows), [f"µ{i}" for i in range(rows)])
+    table.make_multicolumn("tabular", 5, 0, 2, "x", cline = True)
+    table.make_multirow("tabular", 0, 8, 3, "m")
+    table.set_formatters("it", col = 2)
+    table.set_style("grid")
+    return table
+
+@pytest.mark.parametrize("chunk_rows", [1, 4, 23, 1000])
+def test_stream_matches_render(chunk_rows):
+    table = make_table()
+    buf = io.StringIO()
+    table.stream(buf, chunk_rows)
+    assert buf.getvalue() == str(table)
+    assert "".join(table.iter_document(chunk_rows)) == str(table)
+
+def test_chunk_rows_option():
+    table = make_table()
+    full = str(table)
+    table.set_options(chunk_rows = 5)
+    assert str(table) == full
+
+def test_stream_and_save_write_utf8(tmp_path, monkeypatch):
+    monkeypatch.setattr(latex_table, "table_path", None)
+    table = make_table()
+    table.stream(tmp_path / "streamed.tex", 4)
+    table.save(tmp_path / "saved", stream = True)
+    assert (tmp_path / "streamed.tex").read_bytes() == (tmp_path / "saved.tex").read_bytes() == str(table).encode("utf-8")
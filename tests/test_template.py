@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Rendering new data with the layout of a table
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def grid_table():
+    table = latex_table(["a", "b"], [1, 2], [3, 4])
+    table.make_multicolumn("title", 0, 0, 2, "ab")
+    table.set_style("grid")
+    return table
+
+def body_rows(table, chunk_rows = None) -> list:
+    return "".join(table._iter_table_body(chunk_rows)).split("\n\t\t")[:-1]
+
+def test_bind_same_rows_renders_like_the_table():
+    table = grid_table()
+    assert str(table.template().bind([1, 2], [3, 4])) == str(table)
+
+@pytest.mark.parametrize("chunk_rows", [None, 1])
+def test_bind_more_rows_in_grid_style(chunk_rows):
+    bound = grid_table().template().bind(np.arange(4), np.arange(4, 8))
+    rows = body_rows(bound, chunk_rows)
+    assert len(rows) == 4 and all(row.endswith(r"\\ \hline") for row in rows)
+
+def test_bind_keeps_the_rules_of_the_template():
+    columns = [[1, 2, 3, 4], [5, 6, 7, 8], [1, 1, 1, 1], [2, 2, 2, 2]]
+    table = latex_table(["a", "b", "c", "d"], *columns)
+    table.set_style("grid")
+    table.make_multirow("tabular", 0, 0, 3, "m")
+    table.make_multicolumn("tabular", 1, 0, 2, "x", cline = True)
+    assert str(table.template().bind(*columns)) == str(table)
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+Uncertanties of the cells of the tabular
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.latex_table import latex_table
+
+
+def relative_table():
+    table = latex_table(["a"], [5.0, 7.0])
+    table.set_precision([1])
+    table.set_uncertanty(0.1, 0, relative = True)
+    return table
+
+@pytest.mark.parametrize("chunk_rows", [None, 1])
+def test_relative_uncertanty_follows_bound_values(chunk_rows):
+    table = relative_table()
+    assert r"\num{5.0 \pm 0.5}" in str(table)
+    bound = table.template().bind([1.0, 2.0])
+    body = "".join(bound._iter_table_body(chunk_rows))
+    assert r"\num{1.0 \pm 0.1}" in body and r"\num{2.0 \pm 0.2}" in body
+
+def test_absolute_uncertanty_replaces_relative():
+    table = relative_table()
+    table.set_uncertanty(0.1, 0)
+    assert r"\num{5.0 \pm 0.1}" in str(table)